@@ -4,9 +4,29 @@ API Handler for Networking Matchmaking System
 Handles JSON input/output for the complete networking flow
 """
 
+import concurrent.futures
+import contextlib
+import copy
 import json
-from typing import Dict, Any, List, Optional
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Iterator
 from orchestrator import NetworkingOrchestratorSync
+from event_session import EventSession, AttendeeError
+from batch_context import BatchOrchestrator
+from llm_gateway import RETRYABLE_ERRORS
+import perf_trace
+
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+MAX_BATCH_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "50"))
+
+# error_type of error responses: the request itself is wrong, the LLM provider is unavailable
+# (rate limited, timing out or failing), or the service failed while handling a valid request
+ERROR_TYPES = ("invalid_request", "upstream_unavailable", "internal")
+
+# Open incremental event sessions kept in memory; the least recently used one is dropped beyond this
+MAX_EVENT_SESSIONS = int(os.getenv("EVENT_SESSIONS_MAX_ITEMS", "100"))
 
 class NetworkingAPIHandler:
     """
@@ -15,6 +35,9 @@ class NetworkingAPIHandler:
     
     def __init__(self):
         self.orchestrator = NetworkingOrchestratorSync()
+        self.event_sessions: "OrderedDict[str, EventSession]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        self.batch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_BATCH_CONCURRENCY)
     
     def process_user_registration(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -43,12 +66,13 @@ class NetworkingAPIHandler:
                     "give_take_evaluation": dashboard_data.get("give_take_evaluation", {}),
                     "linkedin_summary": dashboard_data.get("linkedin_summary", {}),
                     "networking_recommendations": dashboard_data.get("networking_recommendations", {}),
+                    "from_cache": processed_user.get("from_cache", False),
                     "processing_timestamp": self._get_timestamp()
                 }
             }
             
         except Exception as e:
-            return self._error_response(f"Error processing user registration: {str(e)}")
+            return self._exception_response("Error processing user registration", e)
     
     def get_user_matches(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -71,29 +95,16 @@ class NetworkingAPIHandler:
                 if field not in user_data:
                     return self._error_response(f"Missing required user field: {field}")
             
+            shortlist_size = json_input.get("shortlist_size")
+            if shortlist_size is not None and not self._is_positive_int(shortlist_size):
+                return self._error_response("'shortlist_size' must be a positive integer")
+            
             # Process user and get matches
             processed_user = self.orchestrator.process_user_registration(user_data)
-            matches_result = self.orchestrator.get_user_matches(processed_user, attendees_data)
+            matches_result = self.orchestrator.get_user_matches(processed_user, attendees_data, shortlist_size)
             
             # Format matches for JSON response
-            formatted_matches = []
-            for match in matches_result.get('matches', []):
-                formatted_match = {
-                    "name": match.get("name", ""),
-                    "linkedin_url": match.get("linkedin_url", ""),
-                    "title": match.get("title", ""),
-                    "summary": match.get("summary", ""),
-                    "tags": match.get("tags", []),
-                    "match_percentage": match.get("match_percentage", 0),
-                    "match_score": match.get("match_score", 0.0),
-                    "skills_tags": match.get("skills_tags", []),
-                    "industry_tags": match.get("industry_tags", []),
-                    "networking_tags": match.get("networking_tags", []),
-                    "career_stage": match.get("career_stage", ""),
-                    "networking_persona": match.get("networking_persona", ""),
-                    "reasoning": match.get("reasoning", "")
-                }
-                formatted_matches.append(formatted_match)
+            formatted_matches = [self._format_match(match) for match in matches_result.get('matches', [])]
             
             return {
                 "status": "success",
@@ -104,80 +115,145 @@ class NetworkingAPIHandler:
                         "linkedin_url": user_data["linkedin_url"]
                     },
                     "total_matches": len(formatted_matches),
+                    "registration_from_cache": processed_user.get("from_cache", False),
+                    "candidates_pruned": matches_result.get("candidates_pruned", 0),
+                    "reflection_skipped": matches_result.get("reflection_skipped", False),
+                    "scoring_calls_per_attempt": matches_result.get("scoring_calls_per_attempt", []),
                     "matches": formatted_matches,
                     "processing_timestamp": self._get_timestamp()
                 }
             }
             
         except Exception as e:
-            return self._error_response(f"Error getting user matches: {str(e)}")
+            return self._exception_response("Error getting user matches", e)
     
     def process_event_attendees(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process all event attendees from JSON input
         """
         try:
-            # Validate required fields
-            if "attendees" not in json_input:
-                return self._error_response("Missing 'attendees' field in request")
-            
-            attendees_data = json_input["attendees"]
+            error = self._validate_event_request(json_input)
+            if error:
+                return self._error_response(error)
             
-            if not isinstance(attendees_data, list):
-                return self._error_response("'attendees' must be a list")
-            
-            if len(attendees_data) == 0:
-                return self._error_response("'attendees' list cannot be empty")
-            
-            # Validate each attendee
-            required_fields = ["name", "linkedin_url", "about", "give", "take"]
-            for i, attendee in enumerate(attendees_data):
-                for field in required_fields:
-                    if field not in attendee:
-                        return self._error_response(f"Attendee {i+1} missing required field: {field}")
-            
-            # Process all attendees
-            all_matches = self.orchestrator.get_all_user_matches(attendees_data)
+            # Process all attendees (checkpointed and resumable when an event_id is given)
+            all_matches = self.orchestrator.get_all_user_matches(
+                json_input["attendees"], json_input.get("shortlist_size"), json_input.get("event_id")
+            )
             
             # Format results for JSON response
             formatted_results = {}
             for user_name, user_matches in all_matches.get('all_matches', {}).items():
-                formatted_matches = []
-                for match in user_matches.get('matches', []):
-                    formatted_match = {
-                        "name": match.get("name", ""),
-                        "linkedin_url": match.get("linkedin_url", ""),
-                        "title": match.get("title", ""),
-                        "summary": match.get("summary", ""),
-                        "tags": match.get("tags", []),
-                        "match_percentage": match.get("match_percentage", 0),
-                        "match_score": match.get("match_score", 0.0),
-                        "skills_tags": match.get("skills_tags", []),
-                        "industry_tags": match.get("industry_tags", []),
-                        "networking_tags": match.get("networking_tags", []),
-                        "career_stage": match.get("career_stage", ""),
-                        "networking_persona": match.get("networking_persona", ""),
-                        "reasoning": match.get("reasoning", "")
-                    }
-                    formatted_matches.append(formatted_match)
-                
-                formatted_results[user_name] = {
-                    "total_matches": len(formatted_matches),
-                    "matches": formatted_matches
-                }
+                formatted_results[user_name] = self._format_user_matches(user_matches)
             
             return {
                 "status": "success",
                 "message": f"Successfully processed {all_matches.get('total_users', 0)} attendees",
                 "data": {
                     "total_users": all_matches.get('total_users', 0),
+                    "candidates_pruned": sum(result["candidates_pruned"] for result in formatted_results.values()),
+                    "reflection_skip_rate": self._reflection_skip_rate(
+                        sum(result["reflection_skipped"] for result in formatted_results.values()), len(formatted_results)
+                    ),
                     "user_matches": formatted_results,
+                    "failed_users": all_matches.get('failed_users', []),
+                    "progress": all_matches.get('progress', {}),
                     "processing_timestamp": self._get_timestamp()
                 }
             }
             
         except Exception as e:
-            return self._error_response(f"Error processing event attendees: {str(e)}")
+            return self._exception_response("Error processing event attendees", e)
+    
+    def stream_event_attendees(self, json_input: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Process all event attendees, yielding one JSON object per attendee as soon as
+        their matches are ready, followed by a final summary object
+        """
+        try:
+            error = self._validate_event_request(json_input)
+            if error:
+                yield self._error_response(error)
+                return
+            
+            candidates_pruned = 0
+            reflections_skipped = 0
+            users_matched = 0
+            # Closing the stream early (e.g. the client went away) stops the event run at the next attendee
+            events = self.orchestrator.iter_all_user_matches(
+                json_input["attendees"], json_input.get("shortlist_size"), json_input.get("event_id")
+            )
+            with contextlib.closing(events):
+                for event in events:
+                    if event["type"] == "user_matches":
+                        formatted = self._format_user_matches(event["matches"])
+                        candidates_pruned += formatted["candidates_pruned"]
+                        reflections_skipped += formatted["reflection_skipped"]
+                        users_matched += 1
+                        yield {"type": "user_matches", "user": event["name"], **formatted}
+                    else:
+                        yield {
+                            "type": "summary",
+                            "status": "success",
+                            "message": f"Successfully processed {event['total_users']} attendees",
+                            "data": {
+                                "total_users": event["total_users"],
+                                "candidates_pruned": candidates_pruned,
+                                "reflection_skip_rate": self._reflection_skip_rate(reflections_skipped, users_matched),
+                                "failed_users": event["failed_users"],
+                                "progress": event["progress"],
+                                "processing_timestamp": self._get_timestamp()
+                            }
+                        }
+            
+        except Exception as e:
+            yield self._exception_response("Error processing event attendees", e)
+    
+    def _validate_event_request(self, json_input: Dict[str, Any]) -> Optional[str]:
+        """
+        Validate a process_event request, returning an error message or None
+        """
+        # Validate required fields
+        if "attendees" not in json_input:
+            return "Missing 'attendees' field in request"
+        
+        attendees_data = json_input["attendees"]
+        
+        if not isinstance(attendees_data, list):
+            return "'attendees' must be a list"
+        
+        if len(attendees_data) == 0:
+            return "'attendees' list cannot be empty"
+        
+        # Validate each attendee
+        required_fields = ["name", "linkedin_url", "about", "give", "take"]
+        for i, attendee in enumerate(attendees_data):
+            for field in required_fields:
+                if field not in attendee:
+                    return f"Attendee {i+1} missing required field: {field}"
+        
+        shortlist_size = json_input.get("shortlist_size")
+        if shortlist_size is not None and not self._is_positive_int(shortlist_size):
+            return "'shortlist_size' must be a positive integer"
+        
+        event_id = json_input.get("event_id")
+        if event_id is not None and not isinstance(event_id, str):
+            return "'event_id' must be a string"
+        
+        return None
+    
+    def _format_user_matches(self, user_matches: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format one user's matches for JSON response
+        """
+        formatted_matches = [self._format_match(match) for match in user_matches.get('matches', [])]
+        return {
+            "total_matches": len(formatted_matches),
+            "candidates_pruned": user_matches.get("candidates_pruned", 0),
+            "scoring_calls_per_attempt": user_matches.get("scoring_calls_per_attempt", []),
+            "reflection_skipped": user_matches.get("reflection_skipped", False),
+            "matches": formatted_matches
+        }
     
     def get_user_dashboard(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -208,24 +284,348 @@ class NetworkingAPIHandler:
                     "give_take_evaluation": dashboard_data.get("give_take_evaluation", {}),
                     "linkedin_summary": dashboard_data.get("linkedin_summary", {}),
                     "networking_recommendations": dashboard_data.get("networking_recommendations", {}),
+                    "from_cache": processed_user.get("from_cache", False),
+                    "processing_timestamp": self._get_timestamp()
+                }
+            }
+            
+        except Exception as e:
+            return self._exception_response("Error getting user dashboard", e)
+    
+    def event_add_attendee(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add an attendee to an incremental event session, scoring only the new pairs
+        """
+        try:
+            error = self._validate_event_attendee(json_input)
+            if error:
+                return self._error_response(error)
+            
+            shortlist_size = json_input.get("shortlist_size")
+            if shortlist_size is not None and not self._is_positive_int(shortlist_size):
+                return self._error_response("'shortlist_size' must be a positive integer")
+            
+            session = self._get_event_session(json_input["event_id"], shortlist_size)
+            if shortlist_size is not None and shortlist_size != session.shortlist_size:
+                return self._error_response(
+                    f"'shortlist_size' is set when an event is created; event {session.event_id} uses {session.shortlist_size}"
+                )
+            result = self.orchestrator.run(session.add_attendee(json_input["attendee"]))
+            return self._event_update_response(result)
+            
+        except Exception as e:
+            return self._exception_response("Error adding event attendee", e)
+    
+    def event_update_attendee(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update an attendee in an incremental event session, rescoring only their pairs
+        """
+        try:
+            error = self._validate_event_attendee(json_input)
+            if error:
+                return self._error_response(error)
+            
+            session = self._find_event_session(json_input["event_id"])
+            if session is None:
+                return self._error_response(f"Unknown event: {json_input['event_id']}")
+            
+            result = self.orchestrator.run(session.update_attendee(json_input["attendee"]))
+            return self._event_update_response(result)
+            
+        except Exception as e:
+            return self._exception_response("Error updating event attendee", e)
+    
+    def event_remove_attendee(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Remove an attendee from an incremental event session
+        """
+        try:
+            if "event_id" not in json_input:
+                return self._error_response("Missing 'event_id' field in request")
+            
+            if "name" not in json_input:
+                return self._error_response("Missing 'name' field in request")
+            
+            session = self._find_event_session(json_input["event_id"])
+            if session is None:
+                return self._error_response(f"Unknown event: {json_input['event_id']}")
+            
+            result = self.orchestrator.run(session.remove_attendee(json_input["name"]))
+            return self._event_update_response(result)
+            
+        except Exception as e:
+            return self._exception_response("Error removing event attendee", e)
+    
+    def event_get_matches(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the current matches of an incremental event session
+        """
+        try:
+            if "event_id" not in json_input:
+                return self._error_response("Missing 'event_id' field in request")
+            
+            session = self._find_event_session(json_input["event_id"])
+            if session is None:
+                return self._error_response(f"Unknown event: {json_input['event_id']}")
+            
+            all_matches = session.get_all_user_matches()
+            formatted_results = {}
+            for user_name, user_matches in all_matches["all_matches"].items():
+                formatted_results[user_name] = self._format_user_matches(user_matches)
+            
+            return {
+                "status": "success",
+                "message": f"Matches for {all_matches['total_users']} attendees of event {session.event_id}",
+                "data": {
+                    "event_id": session.event_id,
+                    "total_users": all_matches["total_users"],
+                    "user_matches": formatted_results,
+                    "pair_cache": all_matches["pair_cache"],
+                    "processing_timestamp": self._get_timestamp()
+                }
+            }
+            
+        except Exception as e:
+            return self._exception_response("Error getting event matches", e)
+    
+    def event_close(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Close an incremental event session and free its attendees, embeddings and scores
+        """
+        try:
+            if "event_id" not in json_input:
+                return self._error_response("Missing 'event_id' field in request")
+            
+            with self._sessions_lock:
+                session = self.event_sessions.pop(json_input["event_id"], None)
+            if session is None:
+                return self._error_response(f"Unknown event: {json_input['event_id']}")
+            
+            return {
+                "status": "success",
+                "message": f"Closed event {session.event_id}",
+                "data": {
+                    "event_id": session.event_id,
+                    "total_users": len(session.registrations),
                     "processing_timestamp": self._get_timestamp()
                 }
             }
             
         except Exception as e:
-            return self._error_response(f"Error getting user dashboard: {str(e)}")
+            return self._exception_response("Error closing event", e)
     
-    def _error_response(self, message: str) -> Dict[str, Any]:
+    def process_batch(self, json_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a list of sub-requests concurrently. Registrations, dashboards, pair scores and
+        embeddings are shared between them, so requests about the same person reuse one round of LLM work.
+        """
+        try:
+            if "requests" not in json_input:
+                return self._error_response("Missing 'requests' field in request")
+            
+            sub_requests = json_input["requests"]
+            
+            if not isinstance(sub_requests, list):
+                return self._error_response("'requests' must be a list")
+            
+            if len(sub_requests) == 0:
+                return self._error_response("'requests' list cannot be empty")
+            
+            if len(sub_requests) > MAX_BATCH_REQUESTS:
+                return self._error_response(f"'requests' cannot contain more than {MAX_BATCH_REQUESTS} requests")
+            
+            # A view of this handler whose orchestrator shares work across the batch
+            batch_orchestrator = BatchOrchestrator(self.orchestrator)
+            batch_handler = copy.copy(self)
+            batch_handler.orchestrator = batch_orchestrator
+            
+            batch_orchestrator.prefetch_embeddings(self._batch_profiles(sub_requests))
+            futures = [
+                perf_trace.submit_in_context(self.batch_executor, batch_handler._process_batch_item, sub_request)
+                for sub_request in sub_requests
+            ]
+            responses = [future.result() for future in futures]
+            
+            results = []
+            for i, (sub_request, response) in enumerate(zip(sub_requests, responses)):
+                results.append({
+                    "index": i,
+                    "action": sub_request.get("action") if isinstance(sub_request, dict) else None,
+                    "status": response.get("status"),
+                    "response": response
+                })
+            failed = sum(1 for result in results if result["status"] != "success")
+            
+            return {
+                "status": "success",
+                "message": f"Processed {len(results)} requests ({failed} failed)",
+                "data": {
+                    "results": results,
+                    "succeeded": len(results) - failed,
+                    "failed": failed,
+                    "shared": batch_orchestrator.stats(),
+                    "processing_timestamp": self._get_timestamp()
+                }
+            }
+            
+        except Exception as e:
+            return self._exception_response("Error processing batch", e)
+    
+    def _process_batch_item(self, sub_request: Any) -> Dict[str, Any]:
+        """
+        Process one sub-request of a batch
+        """
+        if not isinstance(sub_request, dict):
+            return self._error_response("Batch requests must be JSON objects")
+        
+        if sub_request.get("action") == "batch":
+            return self._error_response("Batches cannot be nested")
+        
+        return self.process_request(sub_request)
+    
+    def _batch_profiles(self, sub_requests: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Collect every raw profile referenced by a batch's sub-requests
+        """
+        profiles = []
+        for sub_request in sub_requests:
+            if not isinstance(sub_request, dict):
+                continue
+            if sub_request.get("action") == "register_user":
+                profiles.append(sub_request)
+            if isinstance(sub_request.get("user"), dict):
+                profiles.append(sub_request["user"])
+            if isinstance(sub_request.get("attendees"), list):
+                profiles.extend(attendee for attendee in sub_request["attendees"] if isinstance(attendee, dict))
+        return profiles
+    
+    def _get_event_session(self, event_id: str, shortlist_size: Optional[int] = None) -> EventSession:
+        """
+        Get or create the incremental session for an event, dropping the least recently used
+        session when more than MAX_EVENT_SESSIONS are open
+        """
+        with self._sessions_lock:
+            if event_id not in self.event_sessions:
+                self.event_sessions[event_id] = EventSession(self.orchestrator.orchestrator, event_id, shortlist_size)
+                while len(self.event_sessions) > MAX_EVENT_SESSIONS:
+                    self.event_sessions.popitem(last=False)
+            self.event_sessions.move_to_end(event_id)
+            return self.event_sessions[event_id]
+    
+    def _find_event_session(self, event_id: str) -> Optional[EventSession]:
+        """
+        Get the incremental session for an event, or None if it is not open
+        """
+        with self._sessions_lock:
+            session = self.event_sessions.get(event_id)
+            if session is not None:
+                self.event_sessions.move_to_end(event_id)
+            return session
+    
+    def _validate_event_attendee(self, json_input: Dict[str, Any]) -> Optional[str]:
+        """
+        Validate an event attendee request, returning an error message or None
+        """
+        if "event_id" not in json_input:
+            return "Missing 'event_id' field in request"
+        
+        if "attendee" not in json_input:
+            return "Missing 'attendee' field in request"
+        
+        required_fields = ["name", "linkedin_url", "about", "give", "take"]
+        for field in required_fields:
+            if field not in json_input["attendee"]:
+                return f"Missing required attendee field: {field}"
+        
+        return None
+    
+    def _event_update_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format the result of an incremental event update for JSON response
+        """
+        data = {
+            "event_id": result["event_id"],
+            "action": result["action"],
+            "user": result["user"],
+            "affected_users": result["affected_users"],
+            "scoring_calls": result["scoring_calls"],
+            "total_users": result["total_users"],
+            "processing_timestamp": self._get_timestamp()
+        }
+        if "matches" in result:
+            formatted_matches = [self._format_match(match) for match in result["matches"].get("matches", [])]
+            data["total_matches"] = len(formatted_matches)
+            data["matches"] = formatted_matches
+        
+        return {
+            "status": "success",
+            "message": f"Attendee {result['user']} {result['action']} in event {result['event_id']}",
+            "data": data
+        }
+    
+    def _format_match(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Format a single match for JSON response
+        """
+        return {
+            "name": match.get("name", ""),
+            "linkedin_url": match.get("linkedin_url", ""),
+            "title": match.get("title", ""),
+            "summary": match.get("summary", ""),
+            "tags": match.get("tags", []),
+            "match_percentage": match.get("match_percentage", 0),
+            "match_score": match.get("match_score", 0.0),
+            "skills_tags": match.get("skills_tags", []),
+            "industry_tags": match.get("industry_tags", []),
+            "networking_tags": match.get("networking_tags", []),
+            "career_stage": match.get("career_stage", ""),
+            "networking_persona": match.get("networking_persona", ""),
+            "reasoning": match.get("reasoning", "")
+        }
+    
+    def close(self):
+        """
+        Release the orchestrator's background event loop and the agents' thread pools
+        """
+        self.batch_executor.shutdown(wait=False)
+        self.orchestrator.close()
+    
+    def _error_response(self, message: str, error_type: str = "invalid_request") -> Dict[str, Any]:
         """
         Generate standardized error response
         """
         return {
             "status": "error",
             "message": message,
+            "error_type": error_type,
             "data": None,
             "processing_timestamp": self._get_timestamp()
         }
     
+    def _exception_response(self, context: str, error: Exception) -> Dict[str, Any]:
+        """
+        Error response for an exception raised while handling a request, typed by what went wrong
+        """
+        if isinstance(error, AttendeeError):
+            error_type = "invalid_request"
+        elif isinstance(error, RETRYABLE_ERRORS):
+            error_type = "upstream_unavailable"
+        else:
+            error_type = "internal"
+        return self._error_response(f"{context}: {str(error)}", error_type)
+    
+    def _reflection_skip_rate(self, skipped: int, total: int) -> float:
+        """
+        Share of users whose match reflection was skipped by adaptive reflection
+        """
+        return skipped / total if total > 0 else 0.0
+    
+    def _is_positive_int(self, value: Any) -> bool:
+        """
+        Check that a request parameter is a positive integer
+        """
+        return isinstance(value, int) and not isinstance(value, bool) and value > 0
+    
     def _get_timestamp(self) -> str:
         """
         Get current timestamp for processing tracking
@@ -233,9 +633,34 @@ class NetworkingAPIHandler:
         from datetime import datetime
         return datetime.now().isoformat()
     
+    def process_request_stream(self, json_request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Process any JSON request as a stream of JSON objects (one per NDJSON line).
+        process_event streams per-attendee results; other actions yield their single response.
+        """
+        if json_request.get("action") == "process_event":
+            yield from self.stream_event_attendees(json_request)
+        else:
+            yield self.process_request(json_request)
+    
     def process_request(self, json_request: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Main method to process any JSON request
+        Main method to process any JSON request.
+        With "trace": true, a timing tree of the request is attached to the response as "trace",
+        and its LLM, embedding and scrape calls per agent method as "call_counts".
+        """
+        if not json_request.get("trace"):
+            return self._route_request(json_request)
+        
+        with perf_trace.trace(str(json_request.get("action", "request"))) as root:
+            response = self._route_request(json_request)
+        response["trace"] = root.to_dict()
+        response["call_counts"] = root.breakdown()
+        return response
+    
+    def _route_request(self, json_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch a JSON request to the handler for its action
         """
         try:
             # Validate request structure
@@ -253,11 +678,23 @@ class NetworkingAPIHandler:
                 return self.process_event_attendees(json_request)
             elif action == "get_dashboard":
                 return self.get_user_dashboard(json_request)
+            elif action == "event_add_attendee":
+                return self.event_add_attendee(json_request)
+            elif action == "event_update_attendee":
+                return self.event_update_attendee(json_request)
+            elif action == "event_remove_attendee":
+                return self.event_remove_attendee(json_request)
+            elif action == "event_get_matches":
+                return self.event_get_matches(json_request)
+            elif action == "event_close":
+                return self.event_close(json_request)
+            elif action == "batch":
+                return self.process_batch(json_request)
             else:
                 return self._error_response(f"Unknown action: {action}")
                 
         except Exception as e:
-            return self._error_response(f"Error processing request: {str(e)}")
+            return self._exception_response("Error processing request", e)
 
 # Example usage and testing
 def main():
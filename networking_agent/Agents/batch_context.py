@@ -0,0 +1,118 @@
+"""
+Per-batch shared state for the batch API action.
+
+Sub-requests of one batch run concurrently against a BatchOrchestrator, which
+computes each attendee's registration and dashboard recommendations at most
+once and shares one pair-score cache, so overlapping requests for the same
+person reuse the first request's LLM work.
+"""
+
+import copy
+import threading
+from typing import Dict, Any, List, Optional, Callable
+from checkpoint_store import attendee_key
+from orchestrator import NetworkingOrchestratorSync
+from matchmaking_agent import get_embeddings
+from pair_cache import PairScoreCache
+
+class BatchOrchestrator:
+    """
+    Batch-scoped view of a NetworkingOrchestratorSync; anything not memoized is delegated
+    """
+
+    def __init__(self, base: NetworkingOrchestratorSync):
+        self.base = base
+        self.pair_cache = PairScoreCache()
+        self._registrations: Dict[str, Dict[str, Any]] = {}
+        self._dashboards: Dict[str, Dict[str, Any]] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.registrations_computed = 0
+        self.registrations_reused = 0
+        self.dashboards_computed = 0
+        self.dashboards_reused = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.base, name)
+
+    def process_user_registration(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a user once per batch; concurrent requests for the same profile wait for the first
+        """
+        def compute():
+            return self.base.process_user_registration(user_data)
+
+        registration, computed = self._get_or_compute(self._registrations, "registration:" + attendee_key(user_data), compute)
+        with self._lock:
+            if computed:
+                self.registrations_computed += 1
+            else:
+                self.registrations_reused += 1
+        if not computed:
+            registration["from_cache"] = True
+        return registration
+
+    def get_user_dashboard_data(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a processed user's dashboard (and its recommendations LLM call) once per batch
+        """
+        def compute():
+            return self.base.get_user_dashboard_data(user_data)
+
+        dashboard, computed = self._get_or_compute(self._dashboards, "dashboard:" + attendee_key(user_data.get("user_data", {})), compute)
+        with self._lock:
+            if computed:
+                self.dashboards_computed += 1
+            else:
+                self.dashboards_reused += 1
+        return dashboard
+
+    def get_user_matches(self, user_data: Dict[str, Any], all_users: List[Dict[str, Any]],
+                         shortlist_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get matches, sharing pair scores with the batch's other match requests
+        """
+        return self.base.get_user_matches(user_data, all_users, shortlist_size, pair_cache=self.pair_cache)
+
+    def prefetch_embeddings(self, users: List[Dict[str, Any]]) -> None:
+        """
+        Embed every give/ask in the batch in one batched request, so sub-requests hit the embedding cache
+        """
+        texts = []
+        for user in users:
+            texts.append(user.get("give", ""))
+            texts.append(user.get("ask", user.get("take", "")))
+        if texts:
+            get_embeddings(texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get how much work the batch shared between its sub-requests
+        """
+        with self._lock:
+            return {
+                "registrations_computed": self.registrations_computed,
+                "registrations_reused": self.registrations_reused,
+                "dashboards_computed": self.dashboards_computed,
+                "dashboards_reused": self.dashboards_reused,
+                "pair_cache": self.pair_cache.stats()
+            }
+
+    def _get_or_compute(self, entries: Dict[str, Dict[str, Any]], key: str,
+                        compute: Callable[[], Dict[str, Any]]) -> tuple:
+        """
+        Return (a copy of the entry, whether it was computed by this call)
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = entries.get(key)
+            computed = entry is None
+            if computed:
+                entry = compute()
+                with self._lock:
+                    entries[key] = entry
+        # Callers mutate registrations (candidate_profile updates user_data), so hand out copies
+        return copy.deepcopy(entry), computed
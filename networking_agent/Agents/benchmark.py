@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for registration, matching and event processing.
+
+Runs against the fake LLM and embedding providers (see llm_providers.py) with
+injected latency, so it needs no network and gives the same call counts on
+every run. For each roster size it measures:
+    registration    register_users(roster) -> process_user_registration per attendee
+    user_matches    get_user_matches(one attendee, roster)
+    event_matches   get_all_user_matches(roster), registration included
+and reports wall time, LLM calls, embedding calls and peak RSS. Each roster
+size runs in its own process so peak RSS and caches are per size.
+
+Usage:
+    python benchmark.py [--sizes 10,100,1000,5000] [--output benchmark_results.json]
+                        [--baseline previous_results.json] [--tolerance 0.1]
+
+With --baseline, the run fails (exit code 1) when a call count grows beyond
+the tolerance, e.g. when an O(N^2) call pattern comes back.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+SCENARIOS = ["registration", "user_matches", "event_matches"]
+
+# Call counts are deterministic, so these are compared against the baseline
+COUNT_METRICS = ["llm_calls", "embedding_calls", "embedded_texts"]
+
+SKILLS = ["python", "machine learning", "cloud architecture", "product strategy", "fundraising", "design",
+          "sales", "marketing", "data engineering", "security", "mobile apps", "devops", "hiring", "legal"]
+GOALS = ["a technical cofounder", "seed funding", "enterprise customers", "mentorship", "a design partner",
+         "hiring advice", "go-to-market help", "an AI advisor", "cloud credits", "beta testers"]
+
+def make_roster(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Deterministic synthetic attendees with overlapping give/take vocabulary
+    """
+    rng = random.Random(seed)
+    roster = []
+    for i in range(size):
+        skills = rng.sample(SKILLS, 2)
+        goals = rng.sample(GOALS, 2)
+        roster.append({
+            "name": f"Attendee {i}",
+            "linkedin_url": f"https://www.linkedin.com/in/attendee-{i}",
+            "about": f"Professional {i} working on {skills[0]} and {skills[1]}",
+            "give": f"Help with {skills[0]} and advice on {skills[1]}",
+            "take": f"Looking for {goals[0]} and {goals[1]}"
+        })
+    return roster
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_size(size: int) -> Dict[str, Any]:
+    """
+    Run every scenario for one roster size in this process
+    """
+    import asyncio
+    import matchmaking_agent
+    import perf_trace
+    from embedding_cache import EmbeddingCache
+    from orchestrator import NetworkingOrchestrator
+
+    roster = make_roster(size)
+    results: Dict[str, Any] = {}
+
+    for scenario in SCENARIOS:
+        # Fresh orchestrator (registration cache) and embedding cache per scenario
+        matchmaking_agent.embedding_cache = EmbeddingCache(path=None)
+        orchestrator = NetworkingOrchestrator()
+
+        async def run():
+            if scenario == "registration":
+                await orchestrator.register_users(roster)
+            elif scenario == "user_matches":
+                await orchestrator.get_user_matches(registrations[0], registrations)
+            else:
+                await orchestrator.get_all_user_matches(roster)
+
+        registrations = None
+        if scenario == "user_matches":
+            # Setup, not measured: the roster has to be registered first
+            registrations = asyncio.run(orchestrator.register_users(roster))
+            matchmaking_agent.embedding_cache = EmbeddingCache(path=None)
+
+        with perf_trace.trace(scenario) as root:
+            start = time.perf_counter()
+            asyncio.run(run())
+            wall_time = time.perf_counter() - start
+        orchestrator.close()
+
+        counters = root.totals()
+        results[scenario] = {
+            "wall_time_seconds": round(wall_time, 3),
+            "llm_calls": int(counters.get("llm_calls", 0)),
+            "embedding_calls": int(counters.get("embedding_calls", 0)),
+            "embedded_texts": int(counters.get("embedded_texts", 0)),
+            "pair_cache_hits": int(counters.get("pair_cache_hits", 0)),
+            "reflections_skipped": int(counters.get("reflection_skipped", 0))
+        }
+
+    results["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return results
+
+def run_size_in_subprocess(size: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Run one roster size in a child process and return its results
+    """
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--single-size", str(size)],
+        env=env, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark for {size} attendees failed:\n{completed.stderr[-2000:]}")
+    # Agents print progress to stdout; the result is the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def scaling_exponents(results: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Growth exponent of LLM calls between consecutive sizes (1.0 = linear, 2.0 = quadratic)
+    """
+    sizes = sorted(int(size) for size in results)
+    exponents: Dict[str, Dict[str, float]] = {}
+    for scenario in SCENARIOS:
+        for small, large in zip(sizes, sizes[1:]):
+            calls_small = results[str(small)][scenario]["llm_calls"]
+            calls_large = results[str(large)][scenario]["llm_calls"]
+            if calls_small > 0 and calls_large > 0:
+                exponent = math.log(calls_large / calls_small) / math.log(large / small)
+                exponents.setdefault(scenario, {})[f"{small}->{large}"] = round(exponent, 2)
+    return exponents
+
+def compare_with_baseline(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                          time_tolerance: float) -> List[str]:
+    """
+    Compare two benchmark reports, returning failure messages for call-count regressions.
+    Wall-time regressions beyond time_tolerance are printed as warnings only.
+    """
+    failures = []
+    for size, scenarios in current["results"].items():
+        baseline_scenarios = baseline.get("results", {}).get(size)
+        if baseline_scenarios is None:
+            continue
+        for scenario in SCENARIOS:
+            now, before = scenarios.get(scenario), baseline_scenarios.get(scenario)
+            if now is None or before is None:
+                continue
+            for metric in COUNT_METRICS:
+                limit = before.get(metric, 0) * (1 + tolerance)
+                if now.get(metric, 0) > limit:
+                    failures.append(f"{scenario} @ {size}: {metric} {now[metric]} > baseline {before[metric]} (+{tolerance:.0%})")
+            if now["wall_time_seconds"] > before["wall_time_seconds"] * (1 + time_tolerance):
+                print(f"⚠️  {scenario} @ {size}: wall time {now['wall_time_seconds']}s vs baseline {before['wall_time_seconds']}s")
+    return failures
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Print results as a table
+    """
+    print(f"{'size':>6} {'scenario':<14} {'wall (s)':>9} {'llm calls':>10} {'emb calls':>10} {'rss (MB)':>9}")
+    for size in sorted(report["results"], key=int):
+        scenarios = report["results"][size]
+        for scenario in SCENARIOS:
+            result = scenarios[scenario]
+            print(f"{size:>6} {scenario:<14} {result['wall_time_seconds']:>9.2f} {result['llm_calls']:>10} "
+                  f"{result['embedding_calls']:>10} {scenarios['peak_rss_mb']:>9.1f}")
+    for scenario, exponents in report["scaling"].items():
+        print(f"LLM call growth exponent ({scenario}): {exponents}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark registration, matching and event processing")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated roster sizes")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed call-count growth vs baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="Wall-time growth vs baseline that triggers a warning")
+    parser.add_argument("--llm-latency", type=float, default=0.01, help="Simulated seconds per LLM call")
+    parser.add_argument("--embedding-latency", type=float, default=0.02, help="Simulated seconds per embedding request")
+    parser.add_argument("--scrape-latency", type=float, default=0.01, help="Simulated seconds per LinkedIn scrape")
+    parser.add_argument("--registration-mode", choices=["split", "fused"], default="split",
+                        help="Registration mode to benchmark (see REGISTRATION_MODE)")
+    parser.add_argument("--reflection-mode", choices=["always", "adaptive"], default="always",
+                        help="Match reflection mode to benchmark (see MATCH_REFLECTION_MODE)")
+    parser.add_argument("--single-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single_size is not None:
+        # Child process: the parent has already configured the providers through the environment
+        print(json.dumps(run_size(args.single_size)))
+        return
+
+    config = {
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY_SECONDS": str(args.llm_latency),
+        "FAKE_EMBEDDING_LATENCY_SECONDS": str(args.embedding_latency),
+        "LINKEDIN_SCRAPE_DELAY_SECONDS": str(args.scrape_latency),
+        "REGISTRATION_MODE": args.registration_mode,
+        "MATCH_REFLECTION_MODE": args.reflection_mode,
+        # Measure the code, not the gateway's OpenAI rate limits
+        "LLM_REQUESTS_PER_MINUTE": "1000000000",
+        "LLM_TOKENS_PER_MINUTE": "1000000000000",
+        # Disk caches would make every run after the first free
+        "LLM_RESPONSE_CACHE_PATH": "",
+        "EMBEDDING_CACHE_PATH": ""
+    }
+    env = dict(os.environ, **config)
+
+    results = {}
+    for size in (int(size) for size in args.sizes.split(",")):
+        print(f"Benchmarking {size} attendees...")
+        results[str(size)] = run_size_in_subprocess(size, env)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "config": config,
+        "results": results,
+        "scaling": scaling_exponents(results)
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"✅ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        failures = compare_with_baseline(report, baseline, args.tolerance, args.time_tolerance)
+        if failures:
+            print("❌ Regressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("✅ No call-count regressions against baseline")
+
+if __name__ == "__main__":
+    main()
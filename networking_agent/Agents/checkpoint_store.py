@@ -0,0 +1,112 @@
+"""
+Checkpoint store for long-running event processing.
+
+Per-attendee registration and matching results are written to SQLite as
+soon as they complete, so a rerun of the same event id resumes instead of
+starting over.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from embedding_cache import normalize_text
+from registration_cache import PROFILE_FIELDS
+
+DEFAULT_CHECKPOINT_PATH = os.getenv(
+    "CHECKPOINT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "checkpoints.sqlite3")
+)
+
+def attendee_key(user_data: Dict[str, Any]) -> str:
+    """
+    Identify an attendee by the profile fields they submitted
+    """
+    content = {field: normalize_text(str(user_data.get(field, ""))) for field in PROFILE_FIELDS}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+def roster_key(users_data: List[Dict[str, Any]], scoring_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Identify an attendee list and the matchmaking settings; match results are only valid for the roster
+    and settings (shortlist size, reflection mode, model) they were computed with
+    """
+    keys = sorted(attendee_key(user_data) for user_data in users_data)
+    config = json.dumps(scoring_config or {}, sort_keys=True)
+    return hashlib.sha256(("".join(keys) + config).encode("utf-8")).hexdigest()
+
+class EventCheckpoint:
+    """
+    SQLite-backed checkpoint of one event's registrations and matches
+    """
+
+    def __init__(self, event_id: str, path: str = DEFAULT_CHECKPOINT_PATH):
+        self.event_id = event_id
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS registrations (
+                event_id TEXT, attendee_key TEXT, name TEXT, data TEXT, updated_at REAL,
+                PRIMARY KEY (event_id, attendee_key)
+            );
+            CREATE TABLE IF NOT EXISTS matches (
+                event_id TEXT, attendee_key TEXT, roster_key TEXT, name TEXT, data TEXT, updated_at REAL,
+                PRIMARY KEY (event_id, attendee_key)
+            );
+        """)
+        self._conn.commit()
+
+    def get_registration(self, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get a completed registration for an attendee, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM registrations WHERE event_id = ? AND attendee_key = ?",
+                (self.event_id, attendee_key(user_data))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_registration(self, user_data: Dict[str, Any], registration: Dict[str, Any]) -> None:
+        """
+        Persist a completed registration
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO registrations VALUES (?, ?, ?, ?, ?)",
+                (self.event_id, attendee_key(user_data), user_data.get("name", ""), json.dumps(registration), time.time())
+            )
+            self._conn.commit()
+
+    def get_matches(self, user_data: Dict[str, Any], roster: str) -> Optional[Dict[str, Any]]:
+        """
+        Get completed matches for an attendee computed against the same roster, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM matches WHERE event_id = ? AND attendee_key = ? AND roster_key = ?",
+                (self.event_id, attendee_key(user_data), roster)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_matches(self, user_data: Dict[str, Any], roster: str, matches: Dict[str, Any]) -> None:
+        """
+        Persist completed matches for an attendee
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?)",
+                (self.event_id, attendee_key(user_data), roster, user_data.get("name", ""), json.dumps(matches), time.time())
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Close the checkpoint database
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Call-count complexity guardrails for every API action.
+
+Runs each action through NetworkingAPIHandler on the fake LLM and embedding
+providers (see llm_providers.py) for several roster sizes N, and checks the
+LLM, embedding and scrape calls recorded by perf_trace against upper bounds
+written in terms of N, the shortlist size K and the number of match attempts,
+e.g. "process_event with N attendees makes at most N * (3K + 2 * TOP_MATCHES)
+scoring calls". A change that makes an action quadratic, or adds an LLM call
+per candidate, fails here instead of showing up on the invoice.
+
+Usage:
+    python complexity_guardrails.py [--sizes 5,20,50] [--shortlist-size 4] [--registration-mode split|fused] [--verbose]
+
+Exits with code 1 when any bound is exceeded or an action fails.
+"""
+
+import argparse
+import math
+import os
+import sys
+from typing import Dict, Any, List, Optional, Callable
+
+DEFAULT_SIZES = [5, 20, 50]
+
+# LLM calls per registration: split mode makes input quality, LinkedIn summary, profile analysis and
+# give/take evaluation calls; fused mode makes one
+REGISTRATION_LLM_CALLS = {"split": 4, "fused": 1}
+
+# LLM calls added by dashboard data: networking recommendations
+DASHBOARD_LLM_CALLS = 1
+
+class Bound:
+    """
+    Upper bound on one counter of an action, optionally restricted to the calls made by one agent method
+    """
+
+    def __init__(self, counter: str, limit: Callable[[int, int], int], description: str, method: Optional[str] = None):
+        self.counter = counter
+        self.limit = limit
+        self.description = description
+        self.method = method
+
+    @property
+    def name(self) -> str:
+        return f"{self.method}: {self.counter}" if self.method else self.counter
+
+    def observed(self, totals: Dict[str, float], breakdown: Dict[str, Dict[str, float]]) -> int:
+        """
+        The counter's value for the whole action, or for self.method only
+        """
+        if self.method is None:
+            return int(totals.get(self.counter, 0))
+        return int(breakdown.get(self.method, {}).get(self.counter, 0))
+
+def build_guardrails(registration_mode: str = "split") -> Dict[str, List[Bound]]:
+    """
+    Bounds per action as functions of the roster size n and the shortlist size k
+    """
+    from matchmaking_agent import EMBEDDING_BATCH_SIZE, MAX_MATCH_ATTEMPTS, TOP_MATCHES
+    registration_calls = REGISTRATION_LLM_CALLS[registration_mode]
+
+    # Each attempt shortlists k more candidates; a retry also rescores the rejected top matches
+    def scoring(k: int) -> int:
+        return MAX_MATCH_ATTEMPTS * k + (MAX_MATCH_ATTEMPTS - 1) * TOP_MATCHES
+
+    def embedding_batches(texts: int) -> int:
+        return math.ceil(texts / EMBEDDING_BATCH_SIZE)
+
+    registration = [
+        Bound("llm_calls", lambda n, k: registration_calls + DASHBOARD_LLM_CALLS, "constant per user"),
+        Bound("scrape_calls", lambda n, k: 1, "one scrape per user"),
+        Bound("embedding_calls", lambda n, k: 0, "no embeddings")
+    ]
+    return {
+        "register_user": registration,
+        "get_dashboard": registration,
+        "get_matches": [
+            Bound("llm_calls", lambda n, k: registration_calls + scoring(k) + MAX_MATCH_ATTEMPTS,
+                  "independent of n"),
+            Bound("llm_calls", lambda n, k: scoring(k), "attempts * k scoring calls", "MatchmakingAgent._score_pair"),
+            Bound("llm_calls", lambda n, k: MAX_MATCH_ATTEMPTS, "one reflection per attempt",
+                  "MatchmakingAgent._reflection_validate"),
+            Bound("embedding_calls", lambda n, k: embedding_batches(2 * n + 2), "batched give/ask embeddings"),
+            Bound("scrape_calls", lambda n, k: 1, "one scrape per user")
+        ],
+        "process_event": [
+            Bound("llm_calls", lambda n, k: n * (registration_calls + scoring(k) + MAX_MATCH_ATTEMPTS),
+                  "linear in n"),
+            Bound("llm_calls", lambda n, k: n * scoring(k), "n * attempts * k scoring calls", "MatchmakingAgent._score_pair"),
+            Bound("llm_calls", lambda n, k: n * MAX_MATCH_ATTEMPTS, "one reflection per user and attempt",
+                  "MatchmakingAgent._reflection_validate"),
+            Bound("embedding_calls", lambda n, k: embedding_batches(2 * n), "one similarity matrix per event"),
+            Bound("scrape_calls", lambda n, k: n, "one scrape per attendee")
+        ],
+        "event_add_attendee": [
+            Bound("llm_calls", lambda n, k: registration_calls + k + n, "only pairs with the new attendee"),
+            Bound("llm_calls", lambda n, k: k + n, "new attendee's shortlist plus one pair per attendee",
+                  "MatchmakingAgent._score_pair"),
+            Bound("scrape_calls", lambda n, k: 1, "one scrape per user")
+        ],
+        "event_update_attendee": [
+            Bound("llm_calls", lambda n, k: registration_calls + k + n, "only pairs with the updated attendee"),
+            Bound("scrape_calls", lambda n, k: 1, "one scrape per user")
+        ],
+        "event_remove_attendee": [
+            Bound("llm_calls", lambda n, k: n, "one replacement candidate per affected attendee")
+        ],
+        "event_get_matches": [
+            Bound("llm_calls", lambda n, k: 0, "reads maintained matches"),
+            Bound("embedding_calls", lambda n, k: 0, "reads maintained matches")
+        ],
+        "batch": [
+            Bound("llm_calls", lambda n, k: n * (registration_calls + DASHBOARD_LLM_CALLS), "linear in n"),
+            Bound("scrape_calls", lambda n, k: n, "one scrape per sub-request")
+        ]
+    }
+
+def action_requests(action: str, roster: List[Dict[str, Any]], shortlist_size: int) -> List[Dict[str, Any]]:
+    """
+    Requests for one action: every request but the last is unmeasured setup
+    """
+    event_id = "guardrails"
+    add_all = [
+        {"action": "event_add_attendee", "event_id": event_id, "attendee": attendee, "shortlist_size": shortlist_size}
+        for attendee in roster
+    ]
+    if action == "register_user":
+        return [dict(roster[0], action=action)]
+    if action == "get_dashboard":
+        return [{"action": action, "user": roster[0]}]
+    if action == "get_matches":
+        return [{"action": action, "user": roster[0], "attendees": roster, "shortlist_size": shortlist_size}]
+    if action == "process_event":
+        return [{"action": action, "attendees": roster, "shortlist_size": shortlist_size}]
+    if action == "event_add_attendee":
+        return add_all
+    if action == "event_update_attendee":
+        changed = dict(roster[0], take=f"{roster[0]['take']} and a new role")
+        return add_all + [{"action": action, "event_id": event_id, "attendee": changed}]
+    if action == "event_remove_attendee":
+        return add_all + [{"action": action, "event_id": event_id, "name": roster[0]["name"]}]
+    if action == "event_get_matches":
+        return add_all + [{"action": action, "event_id": event_id}]
+    if action == "batch":
+        return [{"action": action, "requests": [dict(attendee, action="register_user") for attendee in roster]}]
+    raise ValueError(f"No guardrail requests for action: {action}")
+
+def run_action(action: str, roster: List[Dict[str, Any]], shortlist_size: int) -> Dict[str, Any]:
+    """
+    Run one action on a fresh handler and return its counter totals and per-method breakdown
+    """
+    import matchmaking_agent
+    import perf_trace
+    from api_handler import NetworkingAPIHandler
+    from embedding_cache import EmbeddingCache
+
+    # Fresh registration, pair and embedding caches, so every call the action needs is counted
+    matchmaking_agent.embedding_cache = EmbeddingCache(path=None)
+    handler = NetworkingAPIHandler()
+    try:
+        *setup, measured = action_requests(action, roster, shortlist_size)
+        for request in setup:
+            response = handler.process_request(request)
+            if response["status"] != "success":
+                raise RuntimeError(f"Setup for {action} failed: {response['message']}")
+
+        with perf_trace.trace(action) as root:
+            response = handler.process_request(measured)
+        if response["status"] != "success":
+            raise RuntimeError(f"{action} failed: {response['message']}")
+        return {"totals": root.totals(), "breakdown": root.breakdown()}
+    finally:
+        handler.close()
+
+def print_breakdown(breakdown: Dict[str, Dict[str, float]]) -> None:
+    """
+    Print the LLM, embedding and scrape calls of each agent method
+    """
+    for method, counters in sorted(breakdown.items()):
+        calls = {counter: int(amount) for counter, amount in counters.items()
+                 if counter in ("llm_calls", "embedding_calls", "scrape_calls")}
+        if calls:
+            print(f"      {method}: {calls}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-action LLM, embedding and scrape call counts against bounds")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated roster sizes")
+    parser.add_argument("--shortlist-size", type=int, default=4, help="Shortlist size K (keep it below the roster sizes)")
+    parser.add_argument("--registration-mode", choices=sorted(REGISTRATION_LLM_CALLS), default="split",
+                        help="Registration mode to check (see REGISTRATION_MODE)")
+    parser.add_argument("--actions", help="Comma-separated actions to check (default: all)")
+    parser.add_argument("--verbose", action="store_true", help="Print calls per agent method")
+    args = parser.parse_args()
+
+    # Deterministic, free and instant providers; no disk caches or rate limits hiding calls
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY_SECONDS": "0",
+        "FAKE_EMBEDDING_LATENCY_SECONDS": "0",
+        "LINKEDIN_SCRAPE_DELAY_SECONDS": "0",
+        "REGISTRATION_MODE": args.registration_mode,
+        "LLM_RESPONSE_CACHE_PATH": "",
+        "EMBEDDING_CACHE_PATH": "",
+        "LLM_REQUESTS_PER_MINUTE": "1000000000",
+        "LLM_TOKENS_PER_MINUTE": "1000000000000"
+    })
+    from benchmark import make_roster
+
+    guardrails = build_guardrails(args.registration_mode)
+    actions = args.actions.split(",") if args.actions else list(guardrails)
+    failures = []
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        roster = make_roster(size)
+        for action in actions:
+            try:
+                result = run_action(action, roster, args.shortlist_size)
+            except Exception as e:
+                failures.append(f"{action} @ {size}: {e}")
+                print(f"❌ {action} @ {size}: {e}")
+                continue
+
+            for bound in guardrails[action]:
+                observed = bound.observed(result["totals"], result["breakdown"])
+                limit = bound.limit(size, args.shortlist_size)
+                ok = observed <= limit
+                print(f"{'✅' if ok else '❌'} {action} @ {size}: {bound.name} {observed} <= {limit} ({bound.description})")
+                if not ok:
+                    failures.append(f"{action} @ {size}: {bound.name} {observed} > {limit} ({bound.description})")
+            if args.verbose:
+                print_breakdown(result["breakdown"])
+
+    if failures:
+        print(f"\n❌ {len(failures)} guardrail(s) exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\n✅ All call counts within bounds")
+
+if __name__ == "__main__":
+    main()
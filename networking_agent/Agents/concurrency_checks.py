@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Concurrency checks for the HTTP service and the batch action.
+
+Runs on the fake LLM and embedding providers (see llm_providers.py) with
+injected latency and checks that parallel get_matches requests really
+overlap: N requests sent at once, over HTTP or as the sub-requests of one
+batch, must finish well within the time the same N requests take one after
+another. A blocking call on the orchestrator's shared event loop serializes
+them and fails the check.
+
+Usage:
+    python concurrency_checks.py [--requests 4] [--llm-latency 0.05] [--max-ratio 0.6]
+
+Exits with code 1 when a check fails.
+"""
+
+import argparse
+import concurrent.futures
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Callable
+
+# Attendees per get_matches request
+ROSTER_SIZE = 12
+
+def match_requests(count: int) -> List[Dict[str, Any]]:
+    """
+    count get_matches requests, each over its own slice of attendees so that a batch cannot share
+    pair scores between them
+    """
+    from benchmark import make_roster
+
+    roster = make_roster(count * ROSTER_SIZE)
+    return [
+        {
+            "action": "get_matches",
+            "user": roster[i * ROSTER_SIZE],
+            "attendees": roster[i * ROSTER_SIZE:(i + 1) * ROSTER_SIZE],
+            "shortlist_size": 4
+        }
+        for i in range(count)
+    ]
+
+def timed(fn: Callable[[], Any]) -> float:
+    """
+    Wall-clock seconds fn takes
+    """
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def measure(requests: List[Dict[str, Any]], run_one: Callable[[Dict[str, Any]], None]) -> Dict[str, float]:
+    """
+    Warm every cache with one untimed pass, then time the requests sequentially and in parallel
+    """
+    for request in requests:
+        run_one(request)
+
+    sequential = timed(lambda: [run_one(request) for request in requests])
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        parallel = timed(lambda: [future.result() for future in [executor.submit(run_one, request) for request in requests]])
+    return {"sequential_seconds": sequential, "parallel_seconds": parallel}
+
+def check_http(requests: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Time the requests over HTTP one at a time and all at once, on a server with one worker per request
+    """
+    import asyncio
+    from api_handler import NetworkingAPIHandler
+    from http_server import NetworkingHTTPServer
+
+    server = NetworkingHTTPServer(NetworkingAPIHandler(), "127.0.0.1", 0, workers=len(requests))
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+
+    def post(request: Dict[str, Any]) -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=300)
+        try:
+            connection.request("POST", "/", body=json.dumps(request), headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            body = json.loads(response.read())
+            if response.status != 200 or body.get("status") != "success":
+                raise RuntimeError(f"HTTP {response.status}: {body.get('message')}")
+        finally:
+            connection.close()
+
+    try:
+        return measure(requests, post)
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+def check_batch(requests: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Time the requests one at a time and as the sub-requests of one batch
+    """
+    from api_handler import NetworkingAPIHandler
+
+    handler = NetworkingAPIHandler()
+
+    def run(request: Dict[str, Any]) -> None:
+        response = handler.process_request(request)
+        if response["status"] != "success":
+            raise RuntimeError(response["message"])
+        failed = response["data"].get("failed") if request["action"] == "batch" else 0
+        if failed:
+            raise RuntimeError(f"{failed} batch sub-request(s) failed")
+
+    batch = {"action": "batch", "requests": requests}
+    try:
+        run(batch)
+        sequential = timed(lambda: [run(request) for request in requests])
+        parallel = timed(lambda: run(batch))
+        return {"sequential_seconds": sequential, "parallel_seconds": parallel}
+    finally:
+        handler.close()
+
+CHECKS = {
+    "http_get_matches": check_http,
+    "batch_get_matches": check_batch
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that parallel requests overlap instead of serializing")
+    parser.add_argument("--requests", type=int, default=4, help="Parallel get_matches requests per check")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--max-ratio", type=float, default=0.6,
+                        help="Largest allowed parallel / sequential wall-time ratio")
+    args = parser.parse_args()
+
+    # Latency only in the fake LLM, so the checks measure overlap of LLM-bound work
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY_SECONDS": str(args.llm_latency),
+        "FAKE_EMBEDDING_LATENCY_SECONDS": "0",
+        "LINKEDIN_SCRAPE_DELAY_SECONDS": "0",
+        "LLM_RESPONSE_CACHE_PATH": "",
+        "EMBEDDING_CACHE_PATH": "",
+        "LLM_REQUESTS_PER_MINUTE": "1000000000",
+        "LLM_TOKENS_PER_MINUTE": "1000000000000"
+    })
+
+    failures = []
+    for name, check in CHECKS.items():
+        timings = check(match_requests(args.requests))
+        ratio = timings["parallel_seconds"] / timings["sequential_seconds"]
+        ok = ratio <= args.max_ratio
+        print(f"{'✅' if ok else '❌'} {name}: {args.requests} requests took {timings['parallel_seconds']:.2f}s in parallel "
+              f"vs {timings['sequential_seconds']:.2f}s sequentially (ratio {ratio:.2f} <= {args.max_ratio})")
+        if not ok:
+            failures.append(name)
+
+    if failures:
+        print(f"\n❌ Requests serialized in: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Parallel requests overlap")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by (model, sha256 of the normalized text). A small
+in-memory LRU sits in front of a SQLite store so each distinct string is
+embedded once per deployment, not once per process.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "embeddings.sqlite3")
+)
+DEFAULT_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "4096"))
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so trivially different strings share one cache entry
+    """
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+class EmbeddingCache:
+    """
+    Two-level (memory LRU + SQLite) cache for embedding vectors
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_memory_items: int = DEFAULT_MEMORY_ITEMS):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, model TEXT, vector BLOB)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """
+        Build the content-addressed key for a (model, text) pair
+        """
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """
+        Return the cached embedding or None, updating hit/miss counters
+        """
+        key = self.make_key(model, text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    vector = array("d", row[0]).tolist()
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, embedding: List[float]) -> None:
+        """
+        Store an embedding in memory and on disk
+        """
+        self.put_many(model, [text], [embedding])
+
+    def put_many(self, model: str, texts: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Store a batch of embeddings in memory and on disk in a single transaction
+        """
+        entries = [
+            (self.make_key(model, text), [float(x) for x in embedding])
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            for key, vector in entries:
+                self._remember(key, vector)
+            if self._conn is not None and entries:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                    [(key, model, array("d", vector).tobytes()) for key, vector in entries]
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """
+        Insert into the memory LRU, evicting the least recently used entry
+        """
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for the cache
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups > 0 else 0,
+                "memory_items": len(self._memory)
+            }
+
+    def close(self) -> None:
+        """
+        Close the on-disk store
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
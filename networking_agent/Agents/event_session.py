@@ -0,0 +1,225 @@
+"""
+Incremental event matching.
+
+An EventSession keeps every processed attendee, their give/ask embeddings
+and their scored pairs, so an attendee joining, updating or leaving only
+costs the pairs that actually change instead of re-running the whole event.
+"""
+
+import asyncio
+from typing import Dict, Any, List, Optional, Set
+import numpy as np
+from orchestrator import NetworkingOrchestrator
+from matchmaking_agent import get_embeddings, DEFAULT_SHORTLIST_SIZE, TOP_MATCHES
+from pair_cache import PairScoreCache
+from embedding_cache import normalize_text
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize a vector, leaving an all-zero vector untouched
+    """
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+class AttendeeError(ValueError):
+    """
+    A request names an attendee the event does not have, or one it already has
+    """
+
+def attendee_name(name: Any) -> str:
+    """
+    Session key for an attendee: the name normalized the same way as cache keys
+    """
+    return normalize_text(str(name)) if name is not None else "Unknown"
+
+class EventSession:
+    """
+    Incrementally maintained matches for one event.
+    Each attendee's shortlist (top candidates by embedding similarity) is scored
+    with the LLM; the top matches are the best-scored shortlisted candidates.
+    """
+
+    def __init__(self, orchestrator: NetworkingOrchestrator, event_id: str, shortlist_size: Optional[int] = None):
+        self.orchestrator = orchestrator
+        self.event_id = event_id
+        self.shortlist_size = shortlist_size or DEFAULT_SHORTLIST_SIZE
+        self.pair_cache = PairScoreCache()
+        self.registrations: Dict[str, Dict[str, Any]] = {}
+        self.profiles: Dict[str, Dict[str, Any]] = {}
+        self.give_embeddings: Dict[str, np.ndarray] = {}
+        self.ask_embeddings: Dict[str, np.ndarray] = {}
+        self.shortlists: Dict[str, List[str]] = {}
+        self.shortlist_floors: Dict[str, float] = {}
+        self.match_scores: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = asyncio.Lock()
+
+    async def add_attendee(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a new attendee and score only the pairs it introduces
+        """
+        name = attendee_name(user_data.get("name"))
+        if name in self.registrations:
+            raise AttendeeError(f"Attendee already in event: {name}")
+
+        registration = await self.orchestrator.process_user_registration(user_data)
+        async with self._lock:
+            if name in self.registrations:
+                raise AttendeeError(f"Attendee already in event: {name}")
+            return await self._insert(registration, "added", set())
+
+    async def update_attendee(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Re-register a changed attendee and rescore only the pairs involving them
+        """
+        name = attendee_name(user_data.get("name"))
+        if name not in self.registrations:
+            raise AttendeeError(f"Unknown attendee: {name}")
+
+        registration = await self.orchestrator.process_user_registration(user_data)
+        async with self._lock:
+            if name not in self.registrations:
+                raise AttendeeError(f"Unknown attendee: {name}")
+            affected = self._delete(name)
+            return await self._insert(registration, "updated", affected)
+
+    async def remove_attendee(self, name: str) -> Dict[str, Any]:
+        """
+        Remove an attendee and backfill the shortlists they were part of
+        """
+        name = attendee_name(name)
+        async with self._lock:
+            if name not in self.registrations:
+                raise AttendeeError(f"Unknown attendee: {name}")
+            affected = self._delete(name)
+            scoring_calls = await self._refresh(affected)
+
+        return {
+            "event_id": self.event_id,
+            "action": "removed",
+            "user": name,
+            "affected_users": sorted(affected),
+            "scoring_calls": scoring_calls,
+            "total_users": len(self.registrations)
+        }
+
+    def get_user_matches(self, name: str) -> Dict[str, Any]:
+        """
+        Get the current matches for an attendee, in the same shape as NetworkingOrchestrator.get_user_matches
+        """
+        name = attendee_name(name)
+        if name not in self.registrations:
+            raise AttendeeError(f"Unknown attendee: {name}")
+
+        scored = sorted(self.match_scores.get(name, {}).values(), key=lambda x: x["score"], reverse=True)
+        registration = self.registrations[name]
+        formatted_matches = self.orchestrator.format_matches_for_display({"top_matches": scored[:TOP_MATCHES]}, registration)
+
+        return {
+            "user": registration,
+            "matches": formatted_matches,
+            "total_matches": len(formatted_matches),
+            "candidates_pruned": max(0, len(self.registrations) - 1 - len(self.shortlists.get(name, [])))
+        }
+
+    def get_all_user_matches(self) -> Dict[str, Any]:
+        """
+        Get the current matches for every attendee
+        """
+        return {
+            "event_id": self.event_id,
+            "all_matches": {name: self.get_user_matches(name) for name in self.registrations},
+            "total_users": len(self.registrations),
+            "pair_cache": self.pair_cache.stats()
+        }
+
+    async def _insert(self, registration: Dict[str, Any], action: str, affected: Set[str]) -> Dict[str, Any]:
+        """
+        Add a processed attendee and refresh every shortlist it enters
+        """
+        profile = self.orchestrator.candidate_profile(registration)
+        name = attendee_name(profile["name"])
+        give_embedding, ask_embedding = await asyncio.to_thread(
+            get_embeddings, [profile["give"], profile.get("ask", profile.get("take", ""))]
+        )
+        give_embedding, ask_embedding = _unit(give_embedding), _unit(ask_embedding)
+
+        # Existing attendees whose shortlist the newcomer enters
+        for other in self.registrations:
+            similarity = (
+                float(self.ask_embeddings[other] @ give_embedding) + float(self.give_embeddings[other] @ ask_embedding)
+            ) / 2
+            if len(self.shortlists.get(other, [])) < self.shortlist_size or similarity > self.shortlist_floors.get(other, -1.0):
+                affected.add(other)
+
+        self.registrations[name] = registration
+        self.profiles[name] = profile
+        self.give_embeddings[name] = give_embedding
+        self.ask_embeddings[name] = ask_embedding
+        affected.add(name)
+
+        scoring_calls = await self._refresh(affected)
+        return {
+            "event_id": self.event_id,
+            "action": action,
+            "user": name,
+            "affected_users": sorted(affected - {name}),
+            "scoring_calls": scoring_calls,
+            "total_users": len(self.registrations),
+            "matches": self.get_user_matches(name)
+        }
+
+    def _delete(self, name: str) -> Set[str]:
+        """
+        Drop an attendee and return the attendees whose shortlist contained them
+        """
+        for mapping in (self.registrations, self.profiles, self.give_embeddings, self.ask_embeddings,
+                        self.shortlists, self.shortlist_floors, self.match_scores):
+            mapping.pop(name, None)
+
+        affected = {other for other, shortlist in self.shortlists.items() if name in shortlist}
+        for other in affected:
+            self.match_scores.get(other, {}).pop(name, None)
+        return affected
+
+    async def _refresh(self, names: Set[str]) -> int:
+        """
+        Recompute shortlists for the given attendees and score only pairs not scored yet.
+        Returns the number of new scoring calls.
+        """
+        misses_before = self.pair_cache.misses
+        for name in sorted(names):
+            if name not in self.registrations:
+                continue
+
+            candidates = [other for other in self.registrations if other != name]
+            if not candidates:
+                self.shortlists[name] = []
+                self.shortlist_floors[name] = -1.0
+                self.match_scores[name] = {}
+                continue
+
+            ask_give_sims = np.stack([self.give_embeddings[other] for other in candidates]) @ self.ask_embeddings[name]
+            give_ask_sims = np.stack([self.ask_embeddings[other] for other in candidates]) @ self.give_embeddings[name]
+            avg_sims = (ask_give_sims + give_ask_sims) / 2
+            order = np.argsort(-avg_sims, kind="stable")[:self.shortlist_size]
+
+            shortlist = [candidates[i] for i in order]
+            self.shortlists[name] = shortlist
+            self.shortlist_floors[name] = float(avg_sims[order[-1]])
+
+            scored = self.match_scores.setdefault(name, {})
+            for other in list(scored):
+                if other not in shortlist:
+                    del scored[other]
+
+            missing = [i for i in order if candidates[i] not in scored]
+            if missing:
+                results = await asyncio.to_thread(
+                    self.orchestrator.matchmaking_agent.score_candidates,
+                    self.profiles[name], [self.profiles[candidates[i]] for i in missing],
+                    ask_give_sims[missing], give_ask_sims[missing], "", self.pair_cache
+                )
+                for i, match in zip(missing, results):
+                    scored[candidates[i]] = match
+
+        return self.pair_cache.misses - misses_before
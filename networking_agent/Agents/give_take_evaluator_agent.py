@@ -1,11 +1,12 @@
 from typing import Dict, Any, List, Tuple
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from llm_gateway import get_llm
+from perf_trace import traced
 
 # Load environment variables
 load_dotenv()
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm()
 
 class GiveTakeEvaluation(BaseModel):
     """Evaluation result for give/take compatibility"""
@@ -23,6 +24,7 @@ class GiveTakeEvaluatorAgent:
     def __init__(self):
         self.llm = llm
     
+    @traced()
     def evaluate_user_give_take(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Evaluate a single user's give/take quality
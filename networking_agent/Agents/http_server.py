@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Long-running HTTP service in front of NetworkingAPIHandler.
+
+One handler (LLM clients, compiled LangGraph workflows, caches) is created
+at startup and shared by every request. Requests are served concurrently by
+a bounded pool of worker threads over keep-alive HTTP/1.1 connections.
+
+Endpoints:
+    POST /                 JSON request with an "action" field (same as process_request)
+    POST /<action>         JSON request body for that action
+    GET  /health           Liveness: the server is accepting connections
+    GET  /ready            Readiness: agents are loaded and workers are available
+
+process_event requests sent with "Accept: application/x-ndjson" are streamed
+back one JSON object per line using chunked transfer encoding.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import sys
+import time
+from typing import Dict, Any, Optional, Tuple
+from api_handler import NetworkingAPIHandler
+from llm_gateway import get_gateway
+
+DEFAULT_HOST = os.getenv("HTTP_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("HTTP_PORT", "8000"))
+DEFAULT_WORKERS = int(os.getenv("HTTP_WORKERS", "8"))
+KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "15"))
+MAX_BODY_BYTES = int(os.getenv("HTTP_MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"
+}
+
+# HTTP status for each error_type of a handler error response (see api_handler.py)
+ERROR_STATUSES = {"invalid_request": 400, "upstream_unavailable": 503, "internal": 500}
+
+class HTTPError(Exception):
+    """
+    Request that cannot be served, answered with the given status code
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class NetworkingHTTPServer:
+    """
+    asyncio HTTP server that runs NetworkingAPIHandler requests on a bounded thread pool
+    """
+
+    def __init__(self, handler: Optional[NetworkingAPIHandler] = None, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.handler = handler
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="networking-http")
+        self.in_flight = 0
+        self.requests_served = 0
+        self.started_at: Optional[float] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._shutting_down = False
+
+    async def start(self) -> None:
+        """
+        Warm up the agents and start accepting connections
+        """
+        self._slots = asyncio.Semaphore(self.workers)
+        if self.handler is None:
+            # Build the agents (and their LLM clients and workflows) once, off the event loop
+            loop = asyncio.get_running_loop()
+            self.handler = await loop.run_in_executor(self.executor, NetworkingAPIHandler)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started_at = time.time()
+        print(f"Networking API listening on http://{self.host}:{self.port} ({self.workers} workers)")
+
+    async def serve_forever(self) -> None:
+        """
+        Start the server and serve until cancelled
+        """
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Stop accepting connections and release the agents
+        """
+        self._shutting_down = True
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+        if self.handler is not None:
+            self.handler.close()
+
+    def is_ready(self) -> bool:
+        """
+        Check whether the server can take new work right now
+        """
+        return self.handler is not None and not self._shutting_down and self.in_flight < self.workers
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve requests on one connection until the client closes it or it idles out
+        """
+        try:
+            while not self._shutting_down:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, self._error_body(e.message), keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = self._keep_alive(headers)
+                try:
+                    await self._dispatch(writer, method, path, headers, body, keep_alive)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, self._error_body(e.message), keep_alive)
+                except Exception as e:
+                    await self._send_json(writer, 500, self._error_body(f"Internal server error: {str(e)}"), keep_alive=False)
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """
+        Read one request, or return None when the client has closed the connection
+        """
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {"_version": version.upper()}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length header")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, writer: asyncio.StreamWriter, method: str, path: str,
+                        headers: Dict[str, str], body: bytes, keep_alive: bool) -> None:
+        """
+        Route one request
+        """
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Use GET for /health")
+            await self._send_json(writer, 200, {
+                "status": "ok",
+                "uptime_seconds": time.time() - self.started_at if self.started_at else 0,
+                "llm_gateway": get_gateway().stats()
+            }, keep_alive)
+            return
+
+        if path == "/ready":
+            if method != "GET":
+                raise HTTPError(405, "Use GET for /ready")
+            ready = self.is_ready()
+            await self._send_json(writer, 200 if ready else 503, {
+                "status": "ready" if ready else "unavailable",
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "requests_served": self.requests_served
+            }, keep_alive)
+            return
+
+        if method != "POST":
+            raise HTTPError(405, "Use POST for API actions")
+
+        json_request = self._parse_body(body)
+        action = path.strip("/")
+        if action:
+            json_request["action"] = action
+
+        if json_request.get("action") == "process_event" and "application/x-ndjson" in headers.get("accept", ""):
+            await self._stream_ndjson(writer, json_request, keep_alive)
+            return
+
+        response = await self._run_in_worker(self.handler.process_request, json_request)
+        await self._send_json(writer, self._status(response), response, keep_alive)
+
+    def _status(self, response: Dict[str, Any]) -> int:
+        """
+        HTTP status for a handler response: 400 only for invalid requests, 5xx for failures behind a valid one
+        """
+        if response.get("status") == "success":
+            return 200
+        return ERROR_STATUSES.get(response.get("error_type"), 500)
+
+    async def _run_in_worker(self, fn, *args) -> Any:
+        """
+        Run a blocking handler call on the worker pool, bounded by the worker limit
+        """
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, fn, *args)
+            finally:
+                self.in_flight -= 1
+                self.requests_served += 1
+
+    async def _stream_ndjson(self, writer: asyncio.StreamWriter, json_request: Dict[str, Any], keep_alive: bool) -> None:
+        """
+        Stream a request's results as chunked NDJSON, one line per result
+        """
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                lines = self.handler.process_request_stream(json_request)
+                try:
+                    writer.write(self._head(200, "application/x-ndjson", keep_alive, chunked=True))
+                    while True:
+                        line = await loop.run_in_executor(self.executor, next, lines, None)
+                        if line is None:
+                            break
+                        if writer.is_closing():
+                            raise ConnectionResetError("Client closed the connection")
+                        chunk = (json.dumps(line) + "\n").encode("utf-8")
+                        writer.write(f"{len(chunk):X}\r\n".encode("latin-1") + chunk + b"\r\n")
+                        await writer.drain()
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+                finally:
+                    # A client that disconnected or a failed write stops the event run instead of
+                    # letting it keep scoring for a socket that is gone; a finished stream is unaffected
+                    await loop.run_in_executor(self.executor, lines.close)
+            finally:
+                self.in_flight -= 1
+                self.requests_served += 1
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool) -> None:
+        """
+        Write a complete JSON response
+        """
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(self._head(status, "application/json", keep_alive, content_length=len(body)) + body)
+        await writer.drain()
+
+    def _head(self, status: int, content_type: str, keep_alive: bool,
+              content_length: Optional[int] = None, chunked: bool = False) -> bytes:
+        """
+        Build the status line and headers of a response
+        """
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+            f"Content-Type: {content_type}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if keep_alive:
+            lines.append(f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}")
+        if chunked:
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append(f"Content-Length: {content_length or 0}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def _parse_body(self, body: bytes) -> Dict[str, Any]:
+        """
+        Decode a JSON object request body
+        """
+        try:
+            json_request = json.loads(body.decode("utf-8")) if body else {}
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(400, "Request body must be valid JSON")
+        if not isinstance(json_request, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return json_request
+
+    def _keep_alive(self, headers: Dict[str, str]) -> bool:
+        """
+        HTTP/1.1 connections stay open unless the client asks to close; HTTP/1.0 only on request
+        """
+        connection = headers.get("connection", "").lower()
+        if headers.get("_version") == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def _error_body(self, message: str) -> Dict[str, Any]:
+        """
+        Error payload in the same shape as NetworkingAPIHandler responses
+        """
+        return {"status": "error", "message": message, "data": None}
+
+def main():
+    """
+    Run the HTTP service: python http_server.py [port]
+    """
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    server = NetworkingHTTPServer(port=port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Networking API stopped")
+
+if __name__ == "__main__":
+    main()
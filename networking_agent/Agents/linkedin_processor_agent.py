@@ -1,11 +1,12 @@
 from typing import List, Dict, Any
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from llm_gateway import get_llm
 from pydantic import BaseModel, Field
+from perf_trace import traced
 
 # Load environment variables
 load_dotenv()
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm()
 
 # --- LinkedIn Data Structure ---
 class LinkedInProfile(BaseModel):
@@ -29,6 +30,7 @@ class LinkedInProcessorAgent:
     def __init__(self):
         self.llm = llm
     
+    @traced()
     def generate_profile_summary_and_tags(self, linkedin_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate summary and tags for a LinkedIn profile
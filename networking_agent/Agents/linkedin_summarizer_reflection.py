@@ -1,13 +1,13 @@
 from typing import Literal
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from llm_gateway import get_llm
 
 # Load environment variables (for OpenAI API key, etc.)
 load_dotenv()
 
 # Initialize the LLM (ensure your OpenAI API key is set in the environment)
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm()
 
 # Mock function to fetch LinkedIn profile data from a URL (replace with real fetch if needed)
 def fetch_linkedin_profile(url: str) -> str:
@@ -20,7 +20,7 @@ def fetch_linkedin_profile(url: str) -> str:
     return "Profile not found."
 
 # LLM agent to summarize the profile
-def linkedin_summarizer_agent(url: str) -> str:
+def linkedin_summarizer_agent(url: str, use_cache: bool = True) -> str:
     profile_text = fetch_linkedin_profile(url)
     system_prompt = (
         "You are an expert career coach. Summarize the following LinkedIn profile in 3-5 sentences, focusing on key skills, experience, and unique strengths. "
@@ -30,7 +30,7 @@ def linkedin_summarizer_agent(url: str) -> str:
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": profile_text},
     ]
-    summary = llm.invoke(messages)
+    summary = llm.invoke(messages, cache=use_cache)
     return summary.content
 
 # Validator for the reflection loop
@@ -56,7 +56,8 @@ def run_linkedin_reflection_loop(url: str, max_attempts: int = 3):
     profile_text = fetch_linkedin_profile(url)
     for attempt in range(max_attempts):
         print(f"\n--- Attempt {attempt+1} ---")
-        summary = linkedin_summarizer_agent(url)
+        # A retry with the same prompt must reach the model, not the response cache
+        summary = linkedin_summarizer_agent(url, use_cache=attempt == 0)
         print(f"Summary: {summary}")
         if reflection_validator(summary, profile_text):
             print("\nFinalized Summary:")
@@ -0,0 +1,182 @@
+"""
+Persistent LLM response cache.
+
+Responses are keyed by a hash of (model, temperature, structured-output
+schema, normalized messages) and stored in SQLite with a TTL. The store is
+size-capped with least-recently-used eviction. Structured results are stored
+as their schema's JSON and raw completions as their message content.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from langchain_core.messages import AIMessage, BaseMessage
+from pydantic import BaseModel
+from embedding_cache import normalize_text
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "LLM_RESPONSE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_responses.sqlite3")
+)
+DEFAULT_TTL_SECONDS = float(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_MAX_ITEMS = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ITEMS", "50000"))
+
+def normalize_messages(messages: Any) -> List[List[str]]:
+    """
+    Reduce any chat input (string, message dicts, LangChain messages or prompt values) to [role, text] pairs
+    """
+    if isinstance(messages, str):
+        return [["user", normalize_text(messages)]]
+    if hasattr(messages, "to_messages"):
+        return normalize_messages(messages.to_messages())
+
+    normalized = []
+    for message in messages:
+        if isinstance(message, str):
+            role, content = "user", message
+        elif isinstance(message, dict):
+            role, content = message.get("role", "user"), message.get("content", "")
+        elif isinstance(message, (list, tuple)):
+            role, content = message[0], message[1]
+        else:
+            role, content = getattr(message, "type", "user"), getattr(message, "content", "")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        normalized.append([str(role), normalize_text(content)])
+    return normalized
+
+def schema_name(schema: Any) -> Optional[str]:
+    """
+    Identify a structured-output schema by its JSON schema, so a changed schema misses the cache
+    """
+    if schema is None:
+        return None
+    if hasattr(schema, "model_json_schema"):
+        return json.dumps(schema.model_json_schema(), sort_keys=True)
+    if isinstance(schema, dict):
+        return json.dumps(schema, sort_keys=True)
+    return getattr(schema, "__qualname__", str(schema))
+
+def encode_response(result: Any) -> Optional[Dict[str, Any]]:
+    """
+    Turn an LLM result into a JSON payload for the response cache, or None if it cannot be cached
+    """
+    # Messages are pydantic models too, so check for them first
+    if isinstance(result, BaseMessage):
+        return {"kind": "message", "content": result.content}
+    if isinstance(result, BaseModel):
+        return {"kind": "structured", "value": result.model_dump()}
+    if isinstance(result, (dict, list, str)):
+        return {"kind": "json", "value": result}
+    return None
+
+def decode_response(payload: Dict[str, Any], schema: Any = None) -> Any:
+    """
+    Rebuild an LLM result from a cached payload
+    """
+    if payload["kind"] == "structured":
+        return schema.model_validate(payload["value"])
+    if payload["kind"] == "message":
+        return AIMessage(content=payload["content"])
+    return payload["value"]
+
+class LLMResponseCache:
+    """
+    SQLite-backed TTL + LRU cache of LLM responses
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_items: int = DEFAULT_MAX_ITEMS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, model TEXT, payload TEXT, created_at REAL, last_used REAL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, temperature: Optional[float], schema: Any, messages: Any) -> str:
+        """
+        Fingerprint one LLM call
+        """
+        content = {
+            "model": model,
+            "temperature": temperature,
+            "schema": schema_name(schema),
+            "messages": normalize_messages(messages)
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a fresh cached payload, or None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, payload: Dict[str, Any]) -> None:
+        """
+        Store a payload, evicting the least recently used entries beyond max_items
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(payload), now, now)
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_items
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0
+            }
+
+    def close(self) -> None:
+        """
+        Close the on-disk store
+        """
+        with self._lock:
+            self._conn.close()
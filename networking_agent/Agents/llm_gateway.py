@@ -0,0 +1,272 @@
+"""
+Shared LLM gateway.
+
+Every agent gets its chat model from get_llm(), so all LLM traffic in the
+process goes through one gateway that:
+- limits requests and tokens per minute with token buckets,
+- caps the number of calls in flight,
+- retries rate-limit and transient errors with jittered exponential backoff,
+- counts throttled, retried and failed calls,
+- serves repeated calls from a persistent response cache (see llm_cache.py).
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+import openai
+from llm_cache import LLMResponseCache, DEFAULT_CACHE_PATH, encode_response, decode_response
+from llm_providers import create_chat_model, persistent_caches_enabled
+import perf_trace
+
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "150000"))
+MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+
+# Completion tokens reserved per call when the real usage is not known up front
+COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "256"))
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError
+)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at capacity per minute
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Block until amount tokens are available and take them; returns the seconds waited
+        """
+        # A single request larger than the bucket may take it all rather than wait forever
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float) -> None:
+        """
+        Charge (or refund, if negative) tokens after the fact, e.g. once real usage is known
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+class LLMGateway:
+    """
+    Rate-limited, retrying entry point for every LLM call in the process
+    """
+
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE, tokens_per_minute: float = TOKENS_PER_MINUTE,
+                 max_in_flight: int = MAX_IN_FLIGHT, max_retries: int = MAX_RETRIES,
+                 response_cache: Optional[LLMResponseCache] = None):
+        self.response_cache = response_cache
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self._in_flight = threading.BoundedSemaphore(max(1, max_in_flight))
+        self._lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "succeeded": 0,
+            "throttled": 0,
+            "throttled_seconds": 0.0,
+            "retried": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "cache_hits": 0
+        }
+
+    def call(self, fn: Callable[[], Any], prompt: Any, cache_key: Optional[str] = None,
+             schema: Any = None, model: str = "") -> Any:
+        """
+        Run one LLM call under the rate limits, retrying retryable errors with backoff.
+        With a cache_key, a cached response is returned without calling the model (or using any rate limit).
+        """
+        if cache_key is not None and self.response_cache is not None:
+            payload = self.response_cache.get(cache_key)
+            if payload is not None:
+                self._count("cache_hits")
+                perf_trace.record("llm_cache_hits")
+                return decode_response(payload, schema)
+
+        estimated_tokens = estimate_tokens(prompt) + COMPLETION_TOKEN_ESTIMATE
+        self._count("calls")
+
+        attempt = 0
+        while True:
+            waited = self.request_bucket.acquire(1) + self.token_bucket.acquire(estimated_tokens)
+            if waited > 0:
+                self._count("throttled")
+                self._count("throttled_seconds", waited)
+
+            try:
+                with self._in_flight:
+                    self._count("in_flight")
+                    try:
+                        result = fn()
+                    finally:
+                        self._count("in_flight", -1)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    self._count("failed")
+                    raise
+                attempt += 1
+                self._count("retried")
+                time.sleep(self._backoff(attempt, e))
+                continue
+            except Exception:
+                self._count("failed")
+                raise
+
+            # Settle the token bucket with the real usage when the response reports it
+            used_tokens = response_tokens(result)
+            if used_tokens is not None:
+                self.token_bucket.adjust(used_tokens - estimated_tokens)
+            self._count("succeeded")
+
+            if cache_key is not None and self.response_cache is not None:
+                payload = encode_response(result)
+                if payload is not None:
+                    self.response_cache.put(cache_key, model, payload)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the gateway's call counters
+        """
+        with self._lock:
+            stats = dict(self.counters)
+        if self.response_cache is not None:
+            stats["response_cache"] = self.response_cache.stats()
+        return stats
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than a server-provided Retry-After
+        """
+        delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    def _count(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+class GatewayRunnable:
+    """
+    Wraps a runnable (a chat model or a structured-output chain) so invoke() goes through the gateway.
+    Pass cache=False to invoke() to skip the response cache for that call.
+    """
+
+    def __init__(self, gateway: LLMGateway, runnable, model=None, schema: Any = None):
+        self.gateway = gateway
+        self.runnable = runnable
+        self.model = model if model is not None else runnable
+        self.schema = schema
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.model, "model_name", "unknown")
+
+    def invoke(self, input: Any, config: Optional[Dict[str, Any]] = None, cache: bool = True, **kwargs) -> Any:
+        cache_key = None
+        if cache and self.gateway.response_cache is not None:
+            cache_key = LLMResponseCache.make_key(
+                self.model_name, getattr(self.model, "temperature", None), self.schema, input
+            )
+        return self.gateway.call(
+            lambda: self.runnable.invoke(input, config, **kwargs), input, cache_key, self.schema, self.model_name
+        )
+
+class GatewayLLM(GatewayRunnable):
+    """
+    Chat model handed to the agents; drop-in for the ChatOpenAI methods they use
+    """
+
+    def with_structured_output(self, schema, **kwargs) -> GatewayRunnable:
+        return GatewayRunnable(self.gateway, self.runnable.with_structured_output(schema, **kwargs), self.runnable, schema)
+
+def estimate_tokens(prompt: Any) -> int:
+    """
+    Rough token count of a prompt (about four characters per token)
+    """
+    if isinstance(prompt, str):
+        text = prompt
+    else:
+        try:
+            text = json.dumps(prompt, default=str)
+        except (TypeError, ValueError):
+            text = str(prompt)
+    return len(text) // 4 + 1
+
+def response_tokens(result: Any) -> Optional[int]:
+    """
+    Total tokens reported on a raw chat response, or None if the result does not carry usage
+    """
+    usage = getattr(result, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens")
+    token_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage")
+    if token_usage:
+        return token_usage.get("total_tokens")
+    return None
+
+_gateway: Optional[LLMGateway] = None
+_models: Dict[str, GatewayLLM] = {}
+_lock = threading.Lock()
+
+def get_gateway() -> LLMGateway:
+    """
+    Get the process-wide gateway
+    """
+    global _gateway
+    with _lock:
+        if _gateway is None:
+            # An empty LLM_RESPONSE_CACHE_PATH disables the response cache, and so does recording
+            use_cache = DEFAULT_CACHE_PATH and persistent_caches_enabled()
+            _gateway = LLMGateway(response_cache=LLMResponseCache() if use_cache else None)
+        return _gateway
+
+def get_llm(model: str = DEFAULT_MODEL) -> GatewayLLM:
+    """
+    Get the shared chat model for the given model name, backed by the configured provider (see llm_providers.py)
+    """
+    gateway = get_gateway()
+    with _lock:
+        if model not in _models:
+            _models[model] = GatewayLLM(gateway, create_chat_model(model))
+        return _models[model]
@@ -0,0 +1,352 @@
+"""
+Pluggable LLM and embedding providers.
+
+LLM_PROVIDER selects what backs every agent's llm and the matchmaking
+embedding model:
+    openai   real ChatOpenAI / OpenAIEmbeddings (default)
+    record   real models, with every response appended to a JSONL recording
+             (the on-disk response and embedding caches are bypassed)
+    replay   responses served from a recording; unrecorded calls raise
+    fake     deterministic synthetic text, structured outputs and embeddings
+
+fake and replay need no network or API key, and simulate provider latency
+with FAKE_LLM_LATENCY_SECONDS and FAKE_EMBEDDING_LATENCY_SECONDS.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import types
+import typing
+from typing import Dict, Any, List, Optional
+import numpy as np
+from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from pydantic import BaseModel
+from embedding_cache import normalize_text
+from llm_cache import LLMResponseCache, normalize_messages, encode_response, decode_response
+import perf_trace
+
+PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+RECORDING_PATH = os.getenv(
+    "LLM_PROVIDER_RECORDING_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "provider_recording.jsonl")
+)
+FAKE_LLM_LATENCY_SECONDS = float(os.getenv("FAKE_LLM_LATENCY_SECONDS", "0"))
+FAKE_EMBEDDING_LATENCY_SECONDS = float(os.getenv("FAKE_EMBEDDING_LATENCY_SECONDS", "0"))
+FAKE_EMBEDDING_DIMENSIONS = int(os.getenv("FAKE_EMBEDDING_DIMENSIONS", "256"))
+
+def _unit_hash(*parts: str) -> float:
+    """
+    Deterministic number in [0, 1) derived from the given strings
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return int(digest[:12], 16) / float(16 ** 12)
+
+class ProviderChatModel:
+    """
+    Base for provider chat models: implements invoke() and with_structured_output() on top of _respond()
+    """
+
+    model_name = "unknown"
+    temperature: Optional[float] = None
+
+    def invoke(self, input: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        return self._respond(input, None)
+
+    def with_structured_output(self, schema, **kwargs) -> "StructuredOutput":
+        return StructuredOutput(self, schema)
+
+    def _respond(self, input: Any, schema: Any) -> Any:
+        raise NotImplementedError
+
+class StructuredOutput:
+    """
+    Structured-output runnable bound to a provider chat model
+    """
+
+    def __init__(self, model: ProviderChatModel, schema: Any):
+        self.model = model
+        self.schema = schema
+
+    def invoke(self, input: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        return self.model._respond(input, self.schema)
+
+class FakeChatModel(ProviderChatModel):
+    """
+    Synthetic chat model: the same prompt always gets the same text or structured output
+    """
+
+    model_name = "fake-chat"
+    temperature = 0.0
+
+    def __init__(self, latency_seconds: float = FAKE_LLM_LATENCY_SECONDS):
+        self.latency_seconds = latency_seconds
+
+    def _respond(self, input: Any, schema: Any) -> Any:
+        perf_trace.record("llm_calls")
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        seed = json.dumps(normalize_messages(input))
+        if schema is not None:
+            return self._fake_value(schema, seed, schema.__name__ if hasattr(schema, "__name__") else "value")
+
+        # Prompts that ask for a bare number (e.g. input quality) get one
+        if "only a number" in seed:
+            return AIMessage(content=f"{_unit_hash(seed):.2f}")
+        return AIMessage(content=f"Synthetic response {hashlib.sha256(seed.encode('utf-8')).hexdigest()[:12]}")
+
+    def _fake_value(self, annotation: Any, seed: str, name: str) -> Any:
+        """
+        Build a deterministic value of the given type
+        """
+        origin = typing.get_origin(annotation)
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+
+        if origin is typing.Union or origin is getattr(types, "UnionType", None):
+            return self._fake_value(args[0], seed, name) if args else None
+        if origin is typing.Literal:
+            return typing.get_args(annotation)[int(_unit_hash(seed, name) * len(typing.get_args(annotation)))]
+        if origin in (list, List):
+            item_type = args[0] if args else str
+            return [self._fake_value(item_type, seed, f"{name}-{i}") for i in range(3)]
+        if origin in (dict, Dict):
+            return {}
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return annotation(**{
+                field: self._fake_value(info.annotation, seed, field)
+                for field, info in annotation.model_fields.items()
+            })
+        if annotation is bool:
+            # Mostly approve, so reflection loops sometimes retry like the real model does
+            return _unit_hash(seed, name) < 0.8
+        if annotation is float:
+            return round(_unit_hash(seed, name), 4)
+        if annotation is int:
+            return int(_unit_hash(seed, name) * 10)
+        return f"synthetic {name} {hashlib.sha256((seed + name).encode('utf-8')).hexdigest()[:8]}"
+
+class RecordingChatModel(ProviderChatModel):
+    """
+    Real chat model whose responses are appended to a recording for later replay
+    """
+
+    def __init__(self, model, recorder: "Recorder"):
+        self.model = model
+        self.recorder = recorder
+        self.model_name = getattr(model, "model_name", "unknown")
+        self.temperature = getattr(model, "temperature", None)
+
+    def _respond(self, input: Any, schema: Any) -> Any:
+        runnable = self.model if schema is None else self.model.with_structured_output(schema)
+        result = runnable.invoke(input)
+        payload = encode_response(result)
+        if payload is not None:
+            key = LLMResponseCache.make_key(self.model_name, self.temperature, schema, input)
+            self.recorder.write({"type": "chat", "key": key, "payload": payload})
+        return result
+
+class ReplayChatModel(ProviderChatModel):
+    """
+    Chat model that answers from a recording, with optional simulated latency
+    """
+
+    def __init__(self, model_name: str, recording: "Recording", latency_seconds: float = FAKE_LLM_LATENCY_SECONDS):
+        self.model_name = model_name
+        self.temperature = recording.temperatures.get(model_name)
+        self.recording = recording
+        self.latency_seconds = latency_seconds
+
+    def _respond(self, input: Any, schema: Any) -> Any:
+        perf_trace.record("llm_calls")
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+        key = LLMResponseCache.make_key(self.model_name, self.temperature, schema, input)
+        payload = self.recording.chat.get(key)
+        if payload is None:
+            raise LookupError(f"No recorded {self.model_name} response for this prompt in {self.recording.path}")
+        return decode_response(payload, schema)
+
+class FakeEmbeddings:
+    """
+    Deterministic hashed bag-of-words embeddings; texts sharing words get similar vectors
+    """
+
+    model = "fake-embedding"
+
+    def __init__(self, dimensions: int = FAKE_EMBEDDING_DIMENSIONS, latency_seconds: float = FAKE_EMBEDDING_LATENCY_SECONDS):
+        self.dimensions = dimensions
+        self.latency_seconds = latency_seconds
+        self._word_vectors: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions)
+        for word in normalize_text(text).lower().split():
+            vector += self._word_vector(word)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm > 0 else vector).tolist()
+
+    def _word_vector(self, word: str) -> np.ndarray:
+        with self._lock:
+            if word not in self._word_vectors:
+                seed = int(hashlib.sha256(word.encode("utf-8")).hexdigest()[:16], 16)
+                self._word_vectors[word] = np.random.default_rng(seed).normal(size=self.dimensions)
+            return self._word_vectors[word]
+
+class RecordingEmbeddings:
+    """
+    Real embedding model whose vectors are appended to a recording for later replay
+    """
+
+    def __init__(self, model, recorder: "Recorder"):
+        self.embedding_model = model
+        self.model = getattr(model, "model", "default")
+        self.recorder = recorder
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.embedding_model.embed_documents(texts)
+        for text, vector in zip(texts, vectors):
+            self.recorder.write({"type": "embedding", "model": self.model, "text": normalize_text(text), "vector": list(vector)})
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+class ReplayEmbeddings:
+    """
+    Embedding model that answers from a recording
+    """
+
+    def __init__(self, recording: "Recording", latency_seconds: float = FAKE_EMBEDDING_LATENCY_SECONDS):
+        self.recording = recording
+        self.model = recording.embedding_model or "default"
+        self.latency_seconds = latency_seconds
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+        vectors = []
+        for text in texts:
+            vector = self.recording.embeddings.get(normalize_text(text))
+            if vector is None:
+                raise LookupError(f"No recorded embedding for this text in {self.recording.path}")
+            vectors.append(vector)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+class Recorder:
+    """
+    Thread-safe JSONL writer for recorded provider responses
+    """
+
+    def __init__(self, path: str = RECORDING_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+class Recording:
+    """
+    Recorded provider responses loaded for replay
+    """
+
+    def __init__(self, path: str = RECORDING_PATH):
+        self.path = path
+        self.chat: Dict[str, Dict[str, Any]] = {}
+        self.embeddings: Dict[str, List[float]] = {}
+        self.temperatures: Dict[str, Optional[float]] = {}
+        self.embedding_model: Optional[str] = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._load(json.loads(line))
+
+    def _load(self, entry: Dict[str, Any]) -> None:
+        if entry["type"] == "chat":
+            self.chat[entry["key"]] = entry["payload"]
+        elif entry["type"] == "chat_model":
+            self.temperatures[entry["model_name"]] = entry["temperature"]
+        elif entry["type"] == "embedding":
+            self.embeddings[entry["text"]] = entry["vector"]
+            self.embedding_model = entry["model"]
+
+_recorder: Optional[Recorder] = None
+_recording: Optional[Recording] = None
+_lock = threading.Lock()
+
+def _get_recorder() -> Recorder:
+    global _recorder
+    with _lock:
+        if _recorder is None:
+            _recorder = Recorder()
+        return _recorder
+
+def _get_recording() -> Recording:
+    global _recording
+    with _lock:
+        if _recording is None:
+            _recording = Recording()
+        return _recording
+
+def persistent_caches_enabled(provider: str = PROVIDER) -> bool:
+    """
+    Whether the on-disk LLM response and embedding caches may answer calls. Not while recording:
+    a cache hit never reaches the recorder, so replay would miss every response the cache served
+    """
+    return provider != "record"
+
+def create_chat_model(model: str, provider: str = PROVIDER):
+    """
+    Build the chat model behind the LLM gateway for the configured provider
+    """
+    if provider == "fake":
+        return FakeChatModel()
+    if provider == "replay":
+        return ReplayChatModel(model, _get_recording())
+
+    # Retries are handled by the gateway, not the client
+    chat_model = ChatOpenAI(model=model, max_retries=0)
+    if provider == "record":
+        recorder = _get_recorder()
+        # Replay rebuilds cache keys from the model's temperature, so record it alongside the responses
+        recorder.write({"type": "chat_model", "model_name": model, "temperature": getattr(chat_model, "temperature", None)})
+        return RecordingChatModel(chat_model, recorder)
+    if provider != "openai":
+        raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
+    return chat_model
+
+def create_embedding_model(provider: str = PROVIDER):
+    """
+    Build the matchmaking embedding model for the configured provider
+    """
+    if provider == "fake":
+        return FakeEmbeddings()
+    if provider == "replay":
+        return ReplayEmbeddings(_get_recording())
+
+    embedding_model = OpenAIEmbeddings()
+    if provider == "record":
+        return RecordingEmbeddings(embedding_model, _get_recorder())
+    if provider != "openai":
+        raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
+    return embedding_model
@@ -6,7 +6,8 @@ Main entry point with JSON-based API interface
 
 import sys
 import json
-from typing import Dict, Any, List
+import contextlib
+from typing import Dict, Any, List, Optional
 from api_handler import NetworkingAPIHandler
 
 class NetworkingMatchmakingSystem:
@@ -23,6 +24,22 @@ class NetworkingMatchmakingSystem:
         """
         return self.api_handler.process_request(json_request)
     
+    def stream_json_request(self, json_request: Dict[str, Any], output_file: str = None):
+        """
+        Process a JSON request and write its results as NDJSON, flushing after every line.
+        Without an output file the NDJSON goes to stdout and progress messages are moved to stderr.
+        """
+        output = open(output_file, 'w') if output_file else sys.stdout
+        progress = contextlib.nullcontext() if output_file else contextlib.redirect_stdout(sys.stderr)
+        try:
+            with progress:
+                for line in self.api_handler.process_request_stream(json_request):
+                    output.write(json.dumps(line) + "\n")
+                    output.flush()
+        finally:
+            if output_file:
+                output.close()
+    
     def register_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Register a new user
@@ -33,7 +50,8 @@ class NetworkingMatchmakingSystem:
         }
         return self.process_json_request(request)
     
-    def get_matches(self, user_data: Dict[str, Any], attendees: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_matches(self, user_data: Dict[str, Any], attendees: List[Dict[str, Any]],
+                    shortlist_size: Optional[int] = None) -> Dict[str, Any]:
         """
         Get matches for a user
         """
@@ -42,9 +60,11 @@ class NetworkingMatchmakingSystem:
             "user": user_data,
             "attendees": attendees
         }
+        if shortlist_size is not None:
+            request["shortlist_size"] = shortlist_size
         return self.process_json_request(request)
     
-    def process_event(self, attendees: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def process_event(self, attendees: List[Dict[str, Any]], shortlist_size: Optional[int] = None) -> Dict[str, Any]:
         """
         Process all event attendees
         """
@@ -52,6 +72,8 @@ class NetworkingMatchmakingSystem:
             "action": "process_event",
             "attendees": attendees
         }
+        if shortlist_size is not None:
+            request["shortlist_size"] = shortlist_size
         return self.process_json_request(request)
     
     def get_dashboard(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -135,15 +157,20 @@ class NetworkingMatchmakingSystem:
         
         print("\n=== Demo Completed ===")
     
-    def process_from_file(self, input_file: str, output_file: str = None):
+    def process_from_file(self, input_file: str, output_file: str = None, ndjson: bool = False):
         """
-        Process JSON request from file
+        Process JSON request from file.
+        With ndjson, results are streamed one JSON object per line as they become ready.
         """
         try:
             # Read input JSON
             with open(input_file, 'r') as f:
                 json_request = json.load(f)
             
+            if ndjson:
+                self.stream_json_request(json_request, output_file)
+                return
+            
             # Process request
             result = self.process_json_request(json_request)
             
@@ -177,13 +204,26 @@ def main():
         
         elif command == "file":
             # Process from file
-            if len(sys.argv) < 3:
-                print("Usage: python main.py file <input_file> [output_file]")
+            ndjson = "--ndjson" in sys.argv
+            args = [arg for arg in sys.argv[2:] if arg != "--ndjson"]
+            if len(args) < 1:
+                print("Usage: python main.py file <input_file> [output_file] [--ndjson]")
                 return
             
-            input_file = sys.argv[2]
-            output_file = sys.argv[3] if len(sys.argv) > 3 else None
-            system.process_from_file(input_file, output_file)
+            input_file = args[0]
+            output_file = args[1] if len(args) > 1 else None
+            system.process_from_file(input_file, output_file, ndjson)
+        
+        elif command == "serve":
+            # Run the long-running HTTP service
+            import asyncio
+            from http_server import NetworkingHTTPServer, DEFAULT_PORT
+            port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+            server = NetworkingHTTPServer(handler=system.api_handler, port=port)
+            try:
+                asyncio.run(server.serve_forever())
+            except KeyboardInterrupt:
+                print("Networking API stopped")
         
         elif command == "register":
             # Example user registration
@@ -222,6 +262,8 @@ def main():
             print("Usage:")
             print("  python main.py demo      - Run full demo")
             print("  python main.py file <input> [output] - Process JSON from file")
+            print("  python main.py file <input> [output] --ndjson - Stream results as NDJSON lines")
+            print("  python main.py serve [port] - Run the HTTP service")
             print("  python main.py register  - Example user registration")
             print("  python main.py matches   - Example getting matches")
             print("  python main.py           - Run demo (default)")
@@ -1,25 +1,98 @@
-from typing import List, Dict, Any, TypedDict
+from typing import List, Dict, Any, TypedDict, Optional
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import AIMessage
-import random
-import re
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from embedding_cache import EmbeddingCache, normalize_text
+from similarity_engine import SimilarityMatrix
+from pair_cache import PairScoreCache
+from llm_gateway import get_llm
+from llm_providers import create_embedding_model, persistent_caches_enabled
+import perf_trace
 
 # Load environment variables
 load_dotenv()
-llm = ChatOpenAI(model="gpt-4o")
-embedding_model = OpenAIEmbeddings()
+llm = get_llm()
+embedding_model = create_embedding_model()
+# Recording keeps the cache in memory only, so every embedding this process needs reaches the recorder
+embedding_cache = EmbeddingCache() if persistent_caches_enabled() else EmbeddingCache(path=None)
+
+# Maximum number of texts sent in a single embed_documents request
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+
+# Number of candidates (ranked by embedding similarity) sent to the LLM scorer per user
+DEFAULT_SHORTLIST_SIZE = int(os.getenv("MATCH_SHORTLIST_SIZE", "10"))
+
+# Number of matches returned per user
+TOP_MATCHES = 3
+
+# Scoring rounds per user: the first one plus retries after a rejected reflection
+MAX_MATCH_ATTEMPTS = 3
+
+# "always" reviews every user's top matches with an LLM call; "adaptive" skips the first review
+# when the top matches clearly outrank the rest of the shortlist
+REFLECTION_MODES = ("always", "adaptive")
+DEFAULT_REFLECTION_MODE = os.getenv("MATCH_REFLECTION_MODE", "always")
+
+# Adaptive reflection: minimum score gap between the last top match and the next candidate
+DEFAULT_REFLECTION_SCORE_GAP = float(os.getenv("MATCH_REFLECTION_SCORE_GAP", "0.1"))
+
+# Adaptive reflection: minimum mean similarity of the top matches over the rest of the shortlist
+DEFAULT_REFLECTION_SIMILARITY_MARGIN = float(os.getenv("MATCH_REFLECTION_SIMILARITY_MARGIN", "0"))
+
+# Maximum number of candidate scoring calls in flight at once
+DEFAULT_SCORING_CONCURRENCY = int(os.getenv("MATCH_SCORING_CONCURRENCY", "8"))
 
 def cosine_similarity(a, b):
     a = np.array(a)
     b = np.array(b)
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
+def cosine_similarities(vector, matrix):
+    """Cosine similarity between one vector and every row of a matrix"""
+    vector = np.asarray(vector, dtype=float)
+    matrix = np.asarray(matrix, dtype=float)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    return matrix @ vector / np.where(norms == 0, 1.0, norms)
+
 def get_embedding(text):
-    return embedding_model.embed_query(text)
+    model_name = getattr(embedding_model, "model", "default")
+    embedding = embedding_cache.get(model_name, text)
+    if embedding is None:
+        perf_trace.record("embedding_calls")
+        embedding = embedding_model.embed_query(normalize_text(text))
+        embedding_cache.put(model_name, text, embedding)
+    else:
+        perf_trace.record("embedding_cache_hits")
+    return embedding
+
+def get_embeddings(texts, batch_size=EMBEDDING_BATCH_SIZE):
+    """Embed many texts, sending only cache misses through embed_documents in batches"""
+    if not texts:
+        return np.zeros((0, 0))
+    model_name = getattr(embedding_model, "model", "default")
+    embeddings = {}
+    missing = []
+    for key in dict.fromkeys(normalize_text(text) for text in texts):
+        cached = embedding_cache.get(model_name, key)
+        if cached is None:
+            missing.append(key)
+        else:
+            embeddings[key] = cached
+    perf_trace.record("embedding_cache_hits", len(embeddings))
+
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        perf_trace.record("embedding_calls")
+        perf_trace.record("embedded_texts", len(batch))
+        batch_embeddings = embedding_model.embed_documents(batch)
+        embedding_cache.put_many(model_name, batch, batch_embeddings)
+        embeddings.update(zip(batch, batch_embeddings))
+
+    return np.array([embeddings[normalize_text(text)] for text in texts], dtype=float)
 
 # --- State Definition ---
 class MatchState(TypedDict):
@@ -31,6 +104,21 @@ class MatchState(TypedDict):
     validated: bool
     reason: str
     messages: List[Any]
+    similarity_matrix: Optional[SimilarityMatrix]
+    shortlist_size: int
+    pruned_count: int
+    similarities: Optional[Any]
+    score_memo: Dict[str, Dict[str, Any]]
+    attempt_calls: List[int]
+    pair_cache: Optional[PairScoreCache]
+    reflection_skipped: bool
+
+# --- Pair Score Model ---
+class PairScore(BaseModel):
+    score_a_to_b: float = Field(description="How good Person B is as a match for Person A (0-1)")
+    reason_a_to_b: str = Field(description="Why Person B is or is not a good match for Person A.")
+    score_b_to_a: float = Field(description="How good Person A is as a match for Person B (0-1)")
+    reason_b_to_a: str = Field(description="Why Person A is or is not a good match for Person B.")
 
 # --- Reflection Validator Model ---
 class MatchReflectionValidator(BaseModel):
@@ -42,11 +130,35 @@ class MatchmakingAgent:
     Agent responsible for matching users based on their give/ask profiles
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = DEFAULT_SCORING_CONCURRENCY,
+                 reflection_mode: str = DEFAULT_REFLECTION_MODE,
+                 reflection_score_gap: float = DEFAULT_REFLECTION_SCORE_GAP,
+                 reflection_similarity_margin: float = DEFAULT_REFLECTION_SIMILARITY_MARGIN):
+        if reflection_mode not in REFLECTION_MODES:
+            raise ValueError(f"Unknown reflection mode: {reflection_mode} (expected one of {', '.join(REFLECTION_MODES)})")
+        self.reflection_mode = reflection_mode
+        self.reflection_score_gap = reflection_score_gap
+        self.reflection_similarity_margin = reflection_similarity_margin
         self.llm = llm
         self.embedding_model = embedding_model
+        self.max_concurrency = max(1, max_concurrency)
+        self.scoring_executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="match-scoring")
         self.graph = self._build_workflow()
     
+    def close(self):
+        """Shut down the scoring thread pool, waiting for calls already running"""
+        self.scoring_executor.shutdown(wait=True, cancel_futures=True)
+    
+    def scoring_config(self, shortlist_size: Optional[int] = None) -> Dict[str, Any]:
+        """Settings that change a user's matches, so saved matches are not reused across them"""
+        return {
+            "shortlist_size": shortlist_size or DEFAULT_SHORTLIST_SIZE,
+            "reflection_mode": self.reflection_mode,
+            "reflection_score_gap": self.reflection_score_gap,
+            "reflection_similarity_margin": self.reflection_similarity_margin,
+            "model": str(getattr(self.llm, "model_name", "unknown"))
+        }
+    
     def _build_workflow(self):
         """Build the LangGraph workflow for matchmaking"""
         workflow = StateGraph(MatchState)
@@ -70,71 +182,162 @@ class MatchmakingAgent:
         
         return workflow.compile()
     
+    @perf_trace.traced()
     def _score_matches(self, state: MatchState) -> MatchState:
         """Score matches using LLM and semantic similarity"""
         user = state["user"]
         candidates = state["candidates"]
-        match_scores = []
+        score_memo = state.setdefault("score_memo", {})
+        attempt_calls = state.setdefault("attempt_calls", [])
+        attempt = len(attempt_calls)
+        state["attempt"] = attempt
+        
+        # Compute partial match scores for all candidates once per invocation
+        if state.get("similarities") is None:
+            state["similarities"] = self._candidate_similarities(state)
+        ask_give_sims, give_ask_sims = state["similarities"]
+        avg_sims = (np.asarray(ask_give_sims, dtype=float) + np.asarray(give_ask_sims, dtype=float)) / 2
+        
+        # Retrieve: rank every candidate by similarity and keep a shortlist for the LLM;
+        # each retry widens the shortlist by another shortlist_size candidates
+        shortlist_size = state.get("shortlist_size") or len(candidates)
+        shortlist = np.argsort(-avg_sims, kind="stable")[:shortlist_size * (attempt + 1)]
+        state["pruned_count"] = len(candidates) - len(shortlist)
+        
+        # Reuse earlier scores; on a retry only newly shortlisted candidates and the
+        # top matches the reviewer objected to cost new LLM calls
+        feedback = state.get("reason", "") if attempt > 0 else ""
+        rejected = {m["name"] for m in state.get("top_matches", [])} if attempt > 0 else set()
+        to_score = [i for i in shortlist if candidates[i]["name"] not in score_memo or candidates[i]["name"] in rejected]
+        
+        # Rerank: score with the LLM concurrently
+        scored = self.score_candidates(
+            user, [candidates[i] for i in to_score],
+            [ask_give_sims[i] for i in to_score], [give_ask_sims[i] for i in to_score],
+            feedback, state.get("pair_cache")
+        )
+        for i, match in zip(to_score, scored):
+            score_memo[candidates[i]["name"]] = match
+        attempt_calls.append(len(to_score))
+        
+        state["match_scores"] = [score_memo[candidates[i]["name"]] for i in shortlist]
+        return state
+    
+    def score_candidates(self, user: Dict[str, Any], candidates: List[Dict[str, Any]], ask_give_sims, give_ask_sims,
+                         feedback: str = "", pair_cache: Optional[PairScoreCache] = None) -> List[Dict[str, Any]]:
+        """Score candidates concurrently; results are collected in candidate order regardless of completion order"""
+        futures = [
+            perf_trace.submit_in_context(
+                self.scoring_executor, self._score_pair, user, other, float(ask_give_sim), float(give_ask_sim), feedback, pair_cache
+            )
+            for other, ask_give_sim, give_ask_sim in zip(candidates, ask_give_sims, give_ask_sims)
+        ]
+        return [future.result() for future in futures]
+    
+    @perf_trace.traced()
+    def _score_pair(self, user: Dict[str, Any], other: Dict[str, Any], ask_give_sim: float, give_ask_sim: float,
+                    feedback: str = "", pair_cache: Optional[PairScoreCache] = None) -> Dict[str, Any]:
+        """Score a single candidate with the LLM and blend in the similarity score"""
+        avg_sim = (ask_give_sim + give_ask_sim) / 2
+        
+        # Reviewer feedback is specific to this user, so those scores are never shared
+        if pair_cache is not None and not feedback:
+            llm_score, reason = pair_cache.get_or_compute(
+                "match_score", user, other,
+                lambda: self._llm_score_pair(user, other, ask_give_sim, give_ask_sim)
+            )
+        else:
+            llm_score, reason = self._llm_score_pair(user, other, ask_give_sim, give_ask_sim, feedback)[0]
         
+        # Blend LLM and similarity score
+        final_score = 0.7 * llm_score + 0.3 * avg_sim
+        
+        return {
+            "name": other["name"],
+            "linkedin_url": other["linkedin_url"],
+            "title": other.get("title", ""),
+            "summary": other.get("summary", ""),
+            "tags": other.get("tags", []),
+            "score": final_score,
+            "llm_score": llm_score,
+            "similarity": avg_sim,
+            "reason": reason
+        }
+    
+    def _llm_score_pair(self, user: Dict[str, Any], other: Dict[str, Any], ask_give_sim: float, give_ask_sim: float,
+                        feedback: str = ""):
+        """Score a pair from both sides in one LLM call; returns ((score, reason) for user, (score, reason) for other)"""
         # Handle both 'ask' and 'take' field names
         user_ask = user.get("ask", user.get("take", ""))
-        user_give_emb = get_embedding(user["give"])
-        user_ask_emb = get_embedding(user_ask)
-        
-        for other in candidates:
-            other_ask = other.get("ask", other.get("take", ""))
-            other_give_emb = get_embedding(other["give"])
-            other_ask_emb = get_embedding(other_ask)
-            
-            # Compute partial match scores
-            ask_give_sim = cosine_similarity(user_ask_emb, other_give_emb)
-            give_ask_sim = cosine_similarity(user_give_emb, other_ask_emb)
-            avg_sim = (ask_give_sim + give_ask_sim) / 2
-            
-            prompt = (
-                f"User's give: {user['give']}\nUser's ask: {user_ask}\n"
-                f"Other's give: {other['give']}\nOther's ask: {other_ask}\n"
-                f"Semantic similarity (user ask <-> other give): {ask_give_sim:.2f}\n"
-                f"Semantic similarity (user give <-> other ask): {give_ask_sim:.2f}\n"
-                "Score this match 0-1 and explain why, considering both the explicit info and the similarity scores."
-            )
-            messages = [
-                {"role": "system", "content": "You are a networking matchmaker. Score and explain."},
-                {"role": "user", "content": prompt},
-            ]
-            result = self.llm.invoke(messages).content
-            score_match = re.search(r"([01](?:\.\d+)?)", result)
-            llm_score = float(score_match.group(1)) if score_match else random.uniform(0.4, 0.8)
-            
-            # Blend LLM and similarity score
-            final_score = 0.7 * llm_score + 0.3 * avg_sim
-            
-            match_scores.append({
-                "name": other["name"],
-                "linkedin_url": other["linkedin_url"],
-                "title": other.get("title", ""),
-                "summary": other.get("summary", ""),
-                "tags": other.get("tags", []),
-                "score": final_score,
-                "llm_score": llm_score,
-                "similarity": avg_sim,
-                "reason": result
-            })
-        
-        state["match_scores"] = match_scores
-        return state
+        other_ask = other.get("ask", other.get("take", ""))
+        
+        # The similarity terms for B -> A are the mirror image of A -> B
+        prompt = (
+            f"Person A's give: {user['give']}\nPerson A's ask: {user_ask}\n"
+            f"Person B's give: {other['give']}\nPerson B's ask: {other_ask}\n"
+            f"Semantic similarity (A ask <-> B give): {ask_give_sim:.2f}\n"
+            f"Semantic similarity (A give <-> B ask): {give_ask_sim:.2f}\n"
+            "Score this match 0-1 from each side (how good B is for A, and how good A is for B) and explain why, "
+            "considering both the explicit info and the similarity scores."
+        )
+        if feedback:
+            prompt += f"\nA reviewer rejected the previous top matches for Person A: {feedback}\nTake that objection into account."
+        messages = [
+            {"role": "system", "content": "You are a networking matchmaker. Score and explain."},
+            {"role": "user", "content": prompt},
+        ]
+        result = self.llm.with_structured_output(PairScore).invoke(messages)
+        
+        return (
+            (max(0.0, min(1.0, result.score_a_to_b)), result.reason_a_to_b),
+            (max(0.0, min(1.0, result.score_b_to_a)), result.reason_b_to_a)
+        )
+    
+    @perf_trace.traced()
+    def _candidate_similarities(self, state: MatchState):
+        """Get ask->give and give->ask similarities for every candidate"""
+        user = state["user"]
+        candidates = state["candidates"]
+        
+        # Read from the event-level matrix when it covers this user and candidates
+        similarity_matrix = state.get("similarity_matrix")
+        if similarity_matrix is not None:
+            similarities = similarity_matrix.similarities(user, candidates)
+            if similarities is not None:
+                return similarities
+        
+        # Otherwise embed every give/ask up front in a handful of batched requests
+        user_ask = user.get("ask", user.get("take", ""))
+        other_asks = [other.get("ask", other.get("take", "")) for other in candidates]
+        embeddings = get_embeddings(
+            [user["give"], user_ask] + [other["give"] for other in candidates] + other_asks
+        )
+        user_give_emb, user_ask_emb = embeddings[0], embeddings[1]
+        other_give_embs = embeddings[2:2 + len(candidates)]
+        other_ask_embs = embeddings[2 + len(candidates):]
+        
+        return cosine_similarities(user_ask_emb, other_give_embs), cosine_similarities(user_give_emb, other_ask_embs)
     
     def _select_top_matches(self, state: MatchState) -> MatchState:
         """Select top matches based on scores"""
         match_scores = state["match_scores"]
         match_scores.sort(key=lambda x: x["score"], reverse=True)
-        state["top_matches"] = match_scores[:3]
+        state["top_matches"] = match_scores[:TOP_MATCHES]
         return state
     
+    @perf_trace.traced()
     def _reflection_validate(self, state: MatchState) -> MatchState:
         """Validate matches using reflection"""
         user = state["user"]
         matches = state["top_matches"]
+        
+        if self._reflection_confident(state):
+            perf_trace.record("reflection_skipped")
+            state["validated"] = True
+            state["reflection_skipped"] = True
+            state["reason"] = f"Reflection skipped: the top {len(matches)} matches clearly outrank the other candidates."
+            return state
+        
         user_ask = user.get("ask", user.get("take", ""))
         prompt = (
             f"User: {user['name']}\nAsk: {user_ask}\nGive: {user['give']}\n"
@@ -150,14 +353,33 @@ class MatchmakingAgent:
         state["reason"] = result.reason
         return state
     
+    def _reflection_confident(self, state: MatchState) -> bool:
+        """
+        Whether adaptive reflection can skip the review: on the first attempt, the last top match beats the
+        next shortlisted candidate by the score gap and the similarities agree with the LLM's ranking.
+        Without a next candidate there is no margin to be confident about, so small events are always reviewed.
+        """
+        if self.reflection_mode != "adaptive" or state["attempt"] > 0 or not state["top_matches"]:
+            return False
+        
+        # match_scores is sorted by select_top_matches, best first
+        ranked = state["match_scores"]
+        top, rest = ranked[:TOP_MATCHES], ranked[TOP_MATCHES:]
+        if not rest:
+            return False
+        
+        score_gap = top[-1]["score"] - rest[0]["score"]
+        similarity_margin = np.mean([m["similarity"] for m in top]) - np.mean([m["similarity"] for m in rest])
+        return score_gap >= self.reflection_score_gap and similarity_margin >= self.reflection_similarity_margin
+    
     def _refine_or_accept(self, state: MatchState) -> str:
         """Decide whether to refine or accept matches"""
         if state["validated"]:
             return "output_matches"
-        elif state["attempt"] >= 2:
+        elif state["attempt"] >= MAX_MATCH_ATTEMPTS - 1:
             return "output_matches"
         else:
-            state["attempt"] += 1
+            # score_matches advances the attempt counter itself
             return "score_matches"
     
     def _output_matches(self, state: MatchState) -> MatchState:
@@ -183,7 +405,15 @@ class MatchmakingAgent:
         state.setdefault("messages", []).append(AIMessage(content=response))
         return state
     
-    def find_matches_for_user(self, user: Dict[str, Any], all_users: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @perf_trace.traced()
+    def build_similarity_matrix(self, users: List[Dict[str, Any]]) -> SimilarityMatrix:
+        """Embed every give/ask once and precompute all pairwise similarities"""
+        return SimilarityMatrix.from_users(users, get_embeddings)
+    
+    def find_matches_for_user(self, user: Dict[str, Any], all_users: List[Dict[str, Any]],
+                              similarity_matrix: Optional[SimilarityMatrix] = None,
+                              shortlist_size: Optional[int] = None,
+                              pair_cache: Optional[PairScoreCache] = None) -> Dict[str, Any]:
         """Find matches for a specific user"""
         candidates = [u for u in all_users if u["name"] != user["name"]]
         
@@ -196,15 +426,26 @@ class MatchmakingAgent:
             "validated": False,
             "reason": "",
             "messages": [],
+            "similarity_matrix": similarity_matrix,
+            "shortlist_size": shortlist_size or DEFAULT_SHORTLIST_SIZE,
+            "pruned_count": 0,
+            "similarities": None,
+            "score_memo": {},
+            "attempt_calls": [],
+            "pair_cache": pair_cache,
+            "reflection_skipped": False,
         }
         
         result = self.graph.invoke(state)
         return result
     
-    def find_matches_for_all_users(self, users: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def find_matches_for_all_users(self, users: List[Dict[str, Any]], shortlist_size: Optional[int] = None,
+                                   pair_cache: Optional[PairScoreCache] = None) -> Dict[str, Any]:
         """Find matches for all users"""
         results = {}
+        similarity_matrix = self.build_similarity_matrix(users)
+        pair_cache = pair_cache if pair_cache is not None else PairScoreCache()
         for user in users:
-            result = self.find_matches_for_user(user, users)
+            result = self.find_matches_for_user(user, users, similarity_matrix, shortlist_size, pair_cache)
             results[user["name"]] = result
         return results 
\ No newline at end of file
@@ -1,33 +1,82 @@
 import asyncio
 import concurrent.futures
-from typing import Dict, Any, List, Optional
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterator
 from user_input_agent import UserInputAgent
 from linkedin_processor_agent import LinkedInProcessorAgent
 from give_take_evaluator_agent import GiveTakeEvaluatorAgent
 from profile_analyzer_agent import ProfileAnalyzerAgent
+from registration_analysis_agent import RegistrationAnalysisAgent
 from matchmaking_agent import MatchmakingAgent
+from similarity_engine import SimilarityMatrix
+from pair_cache import PairScoreCache
+from registration_cache import RegistrationCache
+from checkpoint_store import EventCheckpoint, roster_key
+import perf_trace
 from linkedin_connector import LinkedInConnector
 
+# Maximum number of attendee registrations processed at once during bulk registration
+DEFAULT_REGISTRATION_CONCURRENCY = int(os.getenv("REGISTRATION_CONCURRENCY", "8"))
+
+# "split" runs the four registration agents separately; "fused" gets the same results from one LLM call
+REGISTRATION_MODES = ("split", "fused")
+DEFAULT_REGISTRATION_MODE = os.getenv("REGISTRATION_MODE", "split")
+
+# Delay of the simulated LinkedIn scrape
+SCRAPE_DELAY_SECONDS = float(os.getenv("LINKEDIN_SCRAPE_DELAY_SECONDS", "1"))
+
 class NetworkingOrchestrator:
     """
     Main orchestrator that coordinates all agents for the networking matchmaking system
     """
     
-    def __init__(self):
+    def __init__(self, registration_concurrency: int = DEFAULT_REGISTRATION_CONCURRENCY,
+                 registration_cache: Optional[RegistrationCache] = None,
+                 registration_mode: str = DEFAULT_REGISTRATION_MODE):
+        if registration_mode not in REGISTRATION_MODES:
+            raise ValueError(f"Unknown registration mode: {registration_mode} (expected one of {', '.join(REGISTRATION_MODES)})")
+        self.registration_mode = registration_mode
+        self.registration_concurrency = max(1, registration_concurrency)
+        self.registration_cache = registration_cache if registration_cache is not None else RegistrationCache()
         self.user_input_agent = UserInputAgent()
         self.linkedin_processor = LinkedInProcessorAgent()
         self.give_take_evaluator = GiveTakeEvaluatorAgent()
         self.profile_analyzer = ProfileAnalyzerAgent()
+        self.registration_analyzer = RegistrationAnalysisAgent()
         self.matchmaking_agent = MatchmakingAgent()
     
+    def close(self):
+        """
+        Release the agents' thread pools; call once no matching work is in flight
+        """
+        self.matchmaking_agent.close()
+    
+    @perf_trace.traced()
     async def process_user_registration(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a new user registration with all agents
         """
         print(f"Processing registration for: {user_data.get('name', 'Unknown')}")
         
-        # Step 1: Validate and enhance user input
-        enhanced_user_data = self.user_input_agent.process_user_registration(user_data)
+        # Serve repeat registrations of an unchanged profile from the cache
+        cache_key = RegistrationCache.make_key(user_data, self._model_versions(), self.registration_mode)
+        cached = self.registration_cache.get(cache_key)
+        if cached is not None:
+            perf_trace.record("registration_cache_hits")
+            print(f"Using cached registration for: {user_data.get('name', 'Unknown')}")
+            cached["from_cache"] = True
+            return cached
+        
+        perf_trace.record("registration_cache_misses")
+        
+        if self.registration_mode == "fused":
+            enhanced_user_data, linkedin_data, results = await self._run_fused_registration(user_data)
+            return self._complete_registration(cache_key, enhanced_user_data, linkedin_data, results)
+        
+        # Step 1: Validate and enhance user input (blocking LLM call, keep it off the event loop)
+        enhanced_user_data = await asyncio.to_thread(self.user_input_agent.process_user_registration, user_data)
         
         # Step 2: Trigger LinkedIn scraping (simulated for now)
         linkedin_data = await self._scrape_linkedin_profile(enhanced_user_data['linkedin_url'])
@@ -35,14 +84,43 @@ class NetworkingOrchestrator:
         # Step 3: Run parallel processing
         results = await self._run_parallel_processing(enhanced_user_data, linkedin_data)
         
-        return {
+        return self._complete_registration(cache_key, enhanced_user_data, linkedin_data, results)
+    
+    def _complete_registration(self, cache_key: str, enhanced_user_data: Dict[str, Any],
+                               linkedin_data: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Assemble a registration and store it in the registration cache
+        """
+        registration = {
             "user_data": enhanced_user_data,
             "linkedin_data": linkedin_data,
             "processing_results": results,
             "status": "completed"
         }
+        self.registration_cache.put(cache_key, registration)
+        
+        registration["from_cache"] = False
+        return registration
     
-    async def get_user_matches(self, user_data: Dict[str, Any], all_users: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _model_versions(self) -> Dict[str, str]:
+        """
+        Get the model used by each registration agent, so cached results are invalidated when one changes
+        """
+        if self.registration_mode == "fused":
+            return {"registration_analyzer": str(getattr(self.registration_analyzer.llm, "model_name", "unknown"))}
+        agents = {
+            "user_input": self.user_input_agent,
+            "linkedin_processor": self.linkedin_processor,
+            "give_take_evaluator": self.give_take_evaluator,
+            "profile_analyzer": self.profile_analyzer
+        }
+        return {name: str(getattr(agent.llm, "model_name", "unknown")) for name, agent in agents.items()}
+    
+    @perf_trace.traced()
+    async def get_user_matches(self, user_data: Dict[str, Any], all_users: List[Dict[str, Any]],
+                               similarity_matrix: Optional[SimilarityMatrix] = None,
+                               shortlist_size: Optional[int] = None,
+                               pair_cache: Optional[PairScoreCache] = None) -> Dict[str, Any]:
         """
         Get matches for a specific user
         """
@@ -56,71 +134,194 @@ class NetworkingOrchestrator:
         actual_user_data = user_data.get('user_data', user_data)
         
         # Prepare candidates list with proper structure
-        candidates = []
-        for other_user in all_users:
-            if isinstance(other_user, dict) and 'user_data' in other_user:
-                # This is a processed user
-                candidate_data = other_user['user_data']
-                # Add LinkedIn summary and tags if available
-                if 'processing_results' in other_user:
-                    linkedin_summary = other_user['processing_results'].get('linkedin_summary', {})
-                    profile_analysis = other_user['processing_results'].get('profile_analysis', {})
-                    candidate_data.update({
-                        'summary': linkedin_summary.get('summary', ''),
-                        'tags': linkedin_summary.get('tags', []),
-                        'title': other_user.get('linkedin_data', {}).get('title', ''),
-                        'profile_analysis': profile_analysis
-                    })
-                candidates.append(candidate_data)
-            else:
-                # This is a raw user
-                candidates.append(other_user)
+        candidates = [self.candidate_profile(other_user) for other_user in all_users]
         
-        # Get matches using the matchmaking agent
-        matches_result = self.matchmaking_agent.find_matches_for_user(actual_user_data, candidates)
+        # Get matches using the matchmaking agent (blocking LLM scoring and reflection, keep it off the event loop)
+        matches_result = await asyncio.to_thread(
+            self.matchmaking_agent.find_matches_for_user,
+            actual_user_data, candidates, similarity_matrix, shortlist_size, pair_cache
+        )
         
         # Format the results for frontend display
-        formatted_matches = self._format_matches_for_display(matches_result, user_data)
+        formatted_matches = self.format_matches_for_display(matches_result, user_data)
         
         return {
             "user": user_data,
             "matches": formatted_matches,
-            "total_matches": len(formatted_matches)
+            "total_matches": len(formatted_matches),
+            "candidates_pruned": matches_result.get('pruned_count', 0),
+            "scoring_calls_per_attempt": matches_result.get('attempt_calls', []),
+            "reflection_skipped": matches_result.get('reflection_skipped', False)
         }
     
-    async def get_all_user_matches(self, users_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def candidate_profile(self, user: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get matches for all users in the system
+        Get the flat profile the matchmaking agent scores for a processed or raw user
         """
-        print(f"Processing matches for {len(users_data)} users")
+        if isinstance(user, dict) and 'user_data' in user:
+            # This is a processed user
+            candidate_data = user['user_data']
+            # Add LinkedIn summary and tags if available
+            if 'processing_results' in user:
+                linkedin_summary = user['processing_results'].get('linkedin_summary', {})
+                profile_analysis = user['processing_results'].get('profile_analysis', {})
+                candidate_data.update({
+                    'summary': linkedin_summary.get('summary', ''),
+                    'tags': linkedin_summary.get('tags', []),
+                    'title': user.get('linkedin_data', {}).get('title', ''),
+                    'profile_analysis': profile_analysis
+                })
+            return candidate_data
         
-        # Process all users first
-        processed_users = []
-        for user_data in users_data:
-            processed_user = await self.process_user_registration(user_data)
-            processed_users.append(processed_user)
-        
-        # Get matches for all users
+        # This is a raw user
+        return user
+    
+    async def get_all_user_matches(self, users_data: List[Dict[str, Any]], shortlist_size: Optional[int] = None,
+                                   event_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get matches for all users in the system.
+        With an event_id, per-user results are checkpointed as they complete and a rerun resumes.
+        """
         all_matches = {}
-        for user in processed_users:
-            user_matches = await self.get_user_matches(user, processed_users)
-            all_matches[user['user_data']['name']] = user_matches
+        async for event in self.iter_all_user_matches(users_data, shortlist_size, event_id):
+            if event["type"] == "user_matches":
+                all_matches[event["name"]] = event["matches"]
+            else:
+                summary = event
         
         return {
-            "users": processed_users,
+            "users": summary["users"],
             "all_matches": all_matches,
-            "total_users": len(processed_users)
+            "total_users": summary["total_users"],
+            "failed_users": summary["failed_users"],
+            "pair_cache": summary["pair_cache"],
+            "progress": summary["progress"]
+        }
+    
+    async def iter_all_user_matches(self, users_data: List[Dict[str, Any]], shortlist_size: Optional[int] = None,
+                                    event_id: Optional[str] = None):
+        """
+        Yield each user's matches as soon as they are ready ({"type": "user_matches", ...}),
+        followed by one {"type": "summary", ...} event
+        """
+        print(f"Processing matches for {len(users_data)} users")
+        checkpoint = EventCheckpoint(event_id) if event_id else None
+        progress = {
+            "event_id": event_id,
+            "total_attendees": len(users_data),
+            "registrations_resumed": 0,
+            "registrations_completed": 0,
+            "registrations_failed": 0,
+            "matches_resumed": 0,
+            "matches_completed": 0
         }
+        
+        try:
+            # Process all users first; failed registrations are reported instead of aborting the event
+            registrations = await self.register_users(users_data, checkpoint=checkpoint)
+            registered = [(user_data, user) for user_data, user in zip(users_data, registrations) if user["status"] == "completed"]
+            processed_users = [user for _, user in registered]
+            failed_users = [
+                {"name": user["user_data"].get("name", "Unknown"), "error": user["error"]}
+                for user in registrations if user["status"] == "error"
+            ]
+            progress["registrations_resumed"] = sum(1 for user in processed_users if user.get("from_checkpoint"))
+            progress["registrations_completed"] = len(processed_users) - progress["registrations_resumed"]
+            progress["registrations_failed"] = len(failed_users)
+            
+            # Matches are only reusable when computed against the same set of attendees with the same settings
+            roster = roster_key([user_data for user_data, _ in registered], self.matchmaking_agent.scoring_config(shortlist_size))
+            pending = []
+            for user_data, user in registered:
+                saved_matches = checkpoint.get_matches(user_data, roster) if checkpoint else None
+                if saved_matches is not None:
+                    progress["matches_resumed"] += 1
+                    yield {"type": "user_matches", "name": user['user_data']['name'], "matches": saved_matches}
+                else:
+                    pending.append((user_data, user))
+            
+            # Share pair scores across users so A->B and B->A cost one scoring call
+            pair_cache = PairScoreCache()
+            
+            if pending:
+                # Embed every give/ask once and precompute the full similarity matrix
+                similarity_matrix = await asyncio.to_thread(
+                    self.matchmaking_agent.build_similarity_matrix, [user['user_data'] for user in processed_users]
+                )
+                
+                # Get matches for all users
+                for user_data, user in pending:
+                    user_matches = await self.get_user_matches(user, processed_users, similarity_matrix, shortlist_size, pair_cache)
+                    progress["matches_completed"] += 1
+                    if checkpoint:
+                        # The matches are already computed; losing their checkpoint only costs a redo on resume
+                        try:
+                            checkpoint.save_matches(user_data, roster, user_matches)
+                        except Exception as e:
+                            print(f"Checkpoint save failed for {user['user_data'].get('name', 'Unknown')}: {str(e)}")
+                    yield {"type": "user_matches", "name": user['user_data']['name'], "matches": user_matches}
+        finally:
+            if checkpoint:
+                checkpoint.close()
+        
+        yield {
+            "type": "summary",
+            "users": processed_users,
+            "total_users": len(processed_users),
+            "failed_users": failed_users,
+            "pair_cache": pair_cache.stats(),
+            "progress": progress
+        }
+    
+    @perf_trace.traced()
+    async def register_users(self, users_data: List[Dict[str, Any]], max_concurrency: Optional[int] = None,
+                             checkpoint: Optional[EventCheckpoint] = None) -> List[Dict[str, Any]]:
+        """
+        Register many users concurrently, returning results in input order.
+        A failed registration yields an entry with status "error" instead of raising.
+        With a checkpoint, completed registrations are resumed and new ones saved as they finish.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.registration_concurrency)
+        
+        async def register(user_data: Dict[str, Any]) -> Dict[str, Any]:
+            if checkpoint:
+                saved_registration = checkpoint.get_registration(user_data)
+                if saved_registration is not None:
+                    saved_registration["from_checkpoint"] = True
+                    return saved_registration
+            
+            async with semaphore:
+                try:
+                    registration = await self.process_user_registration(user_data)
+                except Exception as e:
+                    print(f"Registration failed for {user_data.get('name', 'Unknown')}: {str(e)}")
+                    return {
+                        "user_data": user_data,
+                        "status": "error",
+                        "error": str(e)
+                    }
+            
+            if checkpoint:
+                # The registration itself succeeded; losing its checkpoint only costs a redo on resume
+                try:
+                    checkpoint.save_registration(user_data, registration)
+                except Exception as e:
+                    print(f"Checkpoint save failed for {user_data.get('name', 'Unknown')}: {str(e)}")
+            return registration
+        
+        return await asyncio.gather(*(register(user_data) for user_data in users_data))
     
+    @perf_trace.traced()
     async def _scrape_linkedin_profile(self, linkedin_url: str) -> Dict[str, Any]:
         """
         Simulate LinkedIn scraping (replace with actual scraper integration)
         """
         # This is a placeholder - replace with your actual LinkedIn scraper
         print(f"Scraping LinkedIn profile: {linkedin_url}")
+        perf_trace.record("scrape_calls")
         
         # Simulated delay for scraping
-        await asyncio.sleep(1)
+        await asyncio.sleep(SCRAPE_DELAY_SECONDS)
         
         # Return mock LinkedIn data (replace with actual scraper output)
         return {
@@ -135,6 +336,7 @@ class NetworkingOrchestrator:
             ]
         }
     
+    @perf_trace.traced()
     async def _run_parallel_processing(self, user_data: Dict[str, Any], linkedin_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Run all processing agents in parallel
@@ -143,39 +345,80 @@ class NetworkingOrchestrator:
         
         # Create tasks for parallel execution
         tasks = [
-            self._evaluate_give_take(user_data),
-            self._analyze_profile(user_data, linkedin_data),
-            self._generate_linkedin_summary(linkedin_data)
+            self._timed(self._evaluate_give_take(user_data)),
+            self._timed(self._analyze_profile(user_data, linkedin_data)),
+            self._timed(self._generate_linkedin_summary(linkedin_data))
         ]
         
         # Execute all tasks in parallel
         results = await asyncio.gather(*tasks)
         
         return {
-            "give_take_evaluation": results[0],
-            "profile_analysis": results[1],
-            "linkedin_summary": results[2]
+            "give_take_evaluation": results[0][0],
+            "profile_analysis": results[1][0],
+            "linkedin_summary": results[2][0],
+            "timings": {
+                "give_take_evaluation": results[0][1],
+                "profile_analysis": results[1][1],
+                "linkedin_summary": results[2][1]
+            }
+        }
+    
+    @perf_trace.traced()
+    async def _run_fused_registration(self, user_data: Dict[str, Any]) -> tuple:
+        """
+        Register with a single analysis LLM call, split back into the per-agent results.
+        Returns (enhanced user data, LinkedIn data, processing results).
+        """
+        # Validation needs no LLM call; the input quality score comes from the fused analysis
+        user_input = self.user_input_agent.validate_user_input(user_data)
+        linkedin_data = await self._scrape_linkedin_profile(user_input.linkedin_url)
+        
+        analysis, elapsed = await self._timed(
+            asyncio.to_thread(self.registration_analyzer.analyze_registration, user_input.model_dump(), linkedin_data)
+        )
+        enhanced_user_data = self.user_input_agent.enhance_user_input(user_input, analysis["input_quality_score"])
+        
+        results = {
+            "give_take_evaluation": analysis["give_take_evaluation"],
+            "profile_analysis": analysis["profile_analysis"],
+            "linkedin_summary": analysis["linkedin_summary"],
+            # One call produced all three, so each reports the same duration
+            "timings": {
+                "give_take_evaluation": elapsed,
+                "profile_analysis": elapsed,
+                "linkedin_summary": elapsed
+            }
         }
+        return enhanced_user_data, linkedin_data, results
+    
+    async def _timed(self, coroutine) -> tuple:
+        """
+        Await a coroutine and return (result, elapsed seconds)
+        """
+        start = time.perf_counter()
+        result = await coroutine
+        return result, time.perf_counter() - start
     
     async def _evaluate_give_take(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Evaluate user's give/take quality
         """
-        return self.give_take_evaluator.evaluate_user_give_take(user_data)
+        return await asyncio.to_thread(self.give_take_evaluator.evaluate_user_give_take, user_data)
     
     async def _analyze_profile(self, user_data: Dict[str, Any], linkedin_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze user profile comprehensively
         """
-        return self.profile_analyzer.analyze_user_profile(user_data, linkedin_data)
+        return await asyncio.to_thread(self.profile_analyzer.analyze_user_profile, user_data, linkedin_data)
     
     async def _generate_linkedin_summary(self, linkedin_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate LinkedIn summary and tags
         """
-        return self.linkedin_processor.generate_profile_summary_and_tags(linkedin_data)
+        return await asyncio.to_thread(self.linkedin_processor.generate_profile_summary_and_tags, linkedin_data)
     
-    def _format_matches_for_display(self, matches_result: Dict[str, Any], user_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def format_matches_for_display(self, matches_result: Dict[str, Any], user_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Format match results for frontend display
         """
@@ -211,6 +454,7 @@ class NetworkingOrchestrator:
         
         return formatted_matches
     
+    @perf_trace.traced()
     def get_user_dashboard_data(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Get comprehensive dashboard data for a user
@@ -231,53 +475,139 @@ class NetworkingOrchestrator:
             "profile_analysis": results['profile_analysis'],
             "give_take_evaluation": results['give_take_evaluation'],
             "linkedin_summary": results['linkedin_summary'],
+            # Reuse the analysis from registration instead of re-running it
             "networking_recommendations": self.profile_analyzer.generate_networking_recommendations(
                 user_data['user_data'], 
-                user_data.get('linkedin_data')
+                user_data.get('linkedin_data'),
+                analysis=results.get('profile_analysis')
             )
         }
 
+class EventLoopThread:
+    """
+    Long-lived event loop running on a dedicated thread that any caller thread can submit to
+    """
+    
+    def __init__(self, name: str = "orchestrator-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self._thread.start()
+    
+    def _run_loop(self):
+        """
+        Thread target: run the loop until stop() is requested
+        """
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def run(self, coroutine) -> Any:
+        """
+        Run a coroutine on the loop and block the calling thread until it finishes
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("EventLoopThread.run() cannot be called from the loop thread")
+        with self._lock:
+            if self._closed:
+                coroutine.close()
+                raise RuntimeError("EventLoopThread is closed")
+            future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        return future.result()
+    
+    def close(self):
+        """
+        Cancel outstanding work, stop the loop and join its thread
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.loop.shutdown_asyncgens()
+            await self.loop.shutdown_default_executor()
+        
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
 # Synchronous wrapper for easier integration
 class NetworkingOrchestratorSync:
     """
-    Synchronous wrapper for the orchestrator
+    Synchronous wrapper for the orchestrator, backed by one persistent event loop
     """
     
     def __init__(self):
         self.orchestrator = NetworkingOrchestrator()
+        self.loop_thread = EventLoopThread()
     
     def process_user_registration(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Synchronous version of user registration processing
         """
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.orchestrator.process_user_registration(user_data))
-        finally:
-            loop.close()
+        return self.loop_thread.run(self.orchestrator.process_user_registration(user_data))
     
-    def get_user_matches(self, user_data: Dict[str, Any], all_users: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_user_matches(self, user_data: Dict[str, Any], all_users: List[Dict[str, Any]],
+                         shortlist_size: Optional[int] = None,
+                         pair_cache: Optional[PairScoreCache] = None) -> Dict[str, Any]:
         """
         Synchronous version of getting user matches
         """
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.orchestrator.get_user_matches(user_data, all_users))
-        finally:
-            loop.close()
+        return self.loop_thread.run(
+            self.orchestrator.get_user_matches(user_data, all_users, shortlist_size=shortlist_size, pair_cache=pair_cache)
+        )
     
-    def get_all_user_matches(self, users_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_all_user_matches(self, users_data: List[Dict[str, Any]], shortlist_size: Optional[int] = None,
+                             event_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Synchronous version of getting all user matches
         """
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        return self.loop_thread.run(self.orchestrator.get_all_user_matches(users_data, shortlist_size, event_id))
+    
+    def iter_all_user_matches(self, users_data: List[Dict[str, Any]], shortlist_size: Optional[int] = None,
+                              event_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Synchronous version of streaming all user matches
+        """
+        events = self.orchestrator.iter_all_user_matches(users_data, shortlist_size, event_id)
+        
+        async def next_event():
+            return await events.__anext__()
+        
         try:
-            return loop.run_until_complete(self.orchestrator.get_all_user_matches(users_data))
+            while True:
+                try:
+                    yield self.loop_thread.run(next_event())
+                except StopAsyncIteration:
+                    return
         finally:
-            loop.close()
+            self.loop_thread.run(events.aclose())
+    
+    def run(self, coroutine) -> Any:
+        """
+        Run any orchestrator coroutine on the persistent event loop
+        """
+        return self.loop_thread.run(coroutine)
+    
+    def close(self):
+        """
+        Shut down the background event loop, then the agents' thread pools
+        """
+        self.loop_thread.close()
+        self.orchestrator.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def get_user_dashboard_data(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
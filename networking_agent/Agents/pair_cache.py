@@ -0,0 +1,82 @@
+"""
+Event-scoped symmetric pair-score cache.
+
+Pairs are keyed by the unordered pair of profile fingerprints, so scoring
+A against B once also answers B against A for every user in the event.
+"""
+
+import hashlib
+import threading
+from typing import Dict, Any, Callable, Tuple
+from embedding_cache import normalize_text
+import perf_trace
+
+def profile_fingerprint(user: Dict[str, Any]) -> str:
+    """
+    Fingerprint the parts of a profile that pair scores depend on
+    """
+    user_ask = user.get("ask", user.get("take", ""))
+    content = "\x1f".join([
+        normalize_text(user.get("name", "")),
+        normalize_text(user.get("about", "")),
+        normalize_text(user.get("give", "")),
+        normalize_text(user_ask)
+    ])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class PairScoreCache:
+    """
+    Thread-safe cache of pair scores shared by the agents working on one event
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, kind: str, user_a: Dict[str, Any], user_b: Dict[str, Any],
+                       compute: Callable[[], Tuple[Any, Any]]) -> Any:
+        """
+        Return the A->B result for a pair, calling compute() at most once per unordered pair.
+        compute() must return (a_to_b, b_to_a).
+        """
+        fingerprint_a = profile_fingerprint(user_a)
+        fingerprint_b = profile_fingerprint(user_b)
+        key = (kind,) + tuple(sorted((fingerprint_a, fingerprint_b)))
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same pair wait for the first one instead of re-scoring
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    perf_trace.record("pair_cache_hits")
+                    return entry[fingerprint_a]
+                self.misses += 1
+            perf_trace.record("pair_cache_misses")
+
+            a_to_b, b_to_a = compute()
+            with self._lock:
+                self._entries[key] = {fingerprint_b: b_to_a, fingerprint_a: a_to_b}
+            return a_to_b
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0,
+                "pairs": len(self._entries)
+            }
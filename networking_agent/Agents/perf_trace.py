@@ -0,0 +1,208 @@
+"""
+Opt-in per-request performance tracing.
+
+A trace is a tree of timed spans with counters (LLM and embedding calls,
+token usage, cache hits). The current span lives in a context variable, so
+spans opened in asyncio tasks and in worker threads started with
+asyncio.to_thread or submit_in_context attach to the right parent. LLM calls
+are counted by a LangChain callback handler that is only attached while a
+trace is active; without one, every function here is a no-op.
+
+Spans opened by traced() are named after the method ("Class.method"), so
+breakdown() can attribute every LLM, embedding and scrape call to the agent
+and method that made it.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("perf_trace_span", default=None)
+
+class Span:
+    """
+    One timed step of a request, with its own counters and child steps
+    """
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.counters: Dict[str, float] = {}
+        self.children: List["Span"] = []
+        self._lock = threading.Lock()
+
+    def record(self, counter: str, amount: float = 1) -> None:
+        """
+        Add to one of this span's counters
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def add_child(self, child: "Span") -> None:
+        with self._lock:
+            self.children.append(child)
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Get this span's counters summed with those of all its descendants
+        """
+        with self._lock:
+            totals = dict(self.counters)
+            children = list(self.children)
+        for child in children:
+            for counter, amount in child.totals().items():
+                totals[counter] = totals.get(counter, 0) + amount
+        return totals
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """
+        Sum the counters recorded directly on each span by span name, with "spans" counting how often each
+        step ran; a call is attributed to the innermost step that made it, not to every ancestor
+        """
+        breakdown: Dict[str, Dict[str, float]] = {}
+        pending = [self]
+        while pending:
+            current = pending.pop()
+            with current._lock:
+                counters = dict(current.counters)
+                pending.extend(current.children)
+            entry = breakdown.setdefault(current.name, {"spans": 0})
+            entry["spans"] += 1
+            for counter, amount in counters.items():
+                entry[counter] = entry.get(counter, 0) + amount
+        return breakdown
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the span tree; counters are totals for the whole subtree
+        """
+        end = self.end if self.end is not None else time.perf_counter()
+        node: Dict[str, Any] = {"name": self.name, "duration_ms": round((end - self.start) * 1000, 2)}
+        if self.attributes:
+            node["attributes"] = self.attributes
+        totals = self.totals()
+        if totals:
+            node["counters"] = totals
+        with self._lock:
+            children = sorted(self.children, key=lambda child: child.start)
+        if children:
+            node["children"] = [child.to_dict() for child in children]
+        return node
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """
+    Counts LLM calls and token usage on the span that made the call
+    """
+
+    def on_llm_start(self, serialized, prompts, **kwargs) -> None:
+        record("llm_calls")
+
+    def on_chat_model_start(self, serialized, messages, **kwargs) -> None:
+        record("llm_calls")
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            record("prompt_tokens", usage.get("prompt_tokens", 0))
+            record("completion_tokens", usage.get("completion_tokens", 0))
+            return
+
+        # Newer chat models report usage on the message instead of llm_output
+        for generations in response.generations:
+            for generation in generations:
+                usage_metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                record("prompt_tokens", usage_metadata.get("input_tokens", 0))
+                record("completion_tokens", usage_metadata.get("output_tokens", 0))
+
+    def on_llm_error(self, error, **kwargs) -> None:
+        record("llm_errors")
+
+_callback_handler: contextvars.ContextVar[Optional[TraceCallbackHandler]] = contextvars.ContextVar(
+    "perf_trace_callback_handler", default=None
+)
+register_configure_hook(_callback_handler, inheritable=True)
+_handler = TraceCallbackHandler()
+
+@contextmanager
+def trace(name: str, **attributes) -> Iterator[Span]:
+    """
+    Start a trace and yield its root span; inside an active trace this opens a child span instead
+    """
+    parent = _current_span.get()
+    root = Span(name, attributes)
+    if parent is not None:
+        parent.add_child(root)
+    span_token = _current_span.set(root)
+    handler_token = _callback_handler.set(_handler)
+    try:
+        yield root
+    finally:
+        root.end = time.perf_counter()
+        _callback_handler.reset(handler_token)
+        _current_span.reset(span_token)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a step as a child of the current span; does nothing when no trace is active
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, attributes)
+    parent.add_child(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current_span.reset(token)
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator that runs a function or coroutine function inside span(name or the qualified function name)
+    """
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+def record(counter: str, amount: float = 1) -> None:
+    """
+    Add to a counter on the current span, if a trace is active
+    """
+    current = _current_span.get()
+    if current is not None and amount:
+        current.record(counter, amount)
+
+def is_active() -> bool:
+    return _current_span.get() is not None
+
+def submit_in_context(executor, fn, *args):
+    """
+    executor.submit() that runs fn in a copy of the caller's context, so its spans join the caller's trace
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
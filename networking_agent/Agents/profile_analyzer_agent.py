@@ -1,11 +1,12 @@
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from llm_gateway import get_llm
+from perf_trace import traced
 
 # Load environment variables
 load_dotenv()
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm()
 
 class ProfileAnalysis(BaseModel):
     """Comprehensive profile analysis result"""
@@ -25,6 +26,7 @@ class ProfileAnalyzerAgent:
     def __init__(self):
         self.llm = llm
     
+    @traced()
     def analyze_user_profile(self, user_data: Dict[str, Any], linkedin_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Analyze user profile combining LinkedIn data and user input
@@ -83,13 +85,17 @@ class ProfileAnalyzerAgent:
         }
     
     def compare_profiles_for_matching(self, user1: Dict[str, Any], user2: Dict[str, Any], 
-                                    linkedin1: Dict[str, Any] = None, linkedin2: Dict[str, Any] = None) -> Dict[str, Any]:
+                                    linkedin1: Dict[str, Any] = None, linkedin2: Dict[str, Any] = None,
+                                    analysis1: Dict[str, Any] = None, analysis2: Dict[str, Any] = None) -> Dict[str, Any]:
         """
-        Compare two profiles and generate matching insights
+        Compare two profiles and generate matching insights.
+        Pass analysis1/analysis2 to reuse analyses computed during registration.
         """
-        # Analyze both profiles
-        analysis1 = self.analyze_user_profile(user1, linkedin1)
-        analysis2 = self.analyze_user_profile(user2, linkedin2)
+        # Analyze both profiles unless precomputed analyses were provided
+        if analysis1 is None:
+            analysis1 = self.analyze_user_profile(user1, linkedin1)
+        if analysis2 is None:
+            analysis2 = self.analyze_user_profile(user2, linkedin2)
         
         # Generate comparison insights
         prompt = f"""
@@ -158,12 +164,16 @@ class ProfileAnalyzerAgent:
         
         return shared[:5]  # Return top 5 shared interests
     
+    @traced()
     def generate_networking_recommendations(self, user_data: Dict[str, Any], 
-                                          linkedin_data: Dict[str, Any] = None) -> Dict[str, Any]:
+                                          linkedin_data: Dict[str, Any] = None,
+                                          analysis: Dict[str, Any] = None) -> Dict[str, Any]:
         """
-        Generate specific networking recommendations for a user
+        Generate specific networking recommendations for a user.
+        Pass analysis to reuse the profile analysis computed during registration.
         """
-        analysis = self.analyze_user_profile(user_data, linkedin_data)
+        if analysis is None:
+            analysis = self.analyze_user_profile(user_data, linkedin_data)
         
         prompt = f"""
         Based on this profile analysis, generate specific networking recommendations:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Record/replay checks for the LLM providers.
+
+Warms the on-disk LLM response and embedding caches with an ordinary run,
+records the same requests with LLM_PROVIDER=record on top of those warm
+caches, then replays them with LLM_PROVIDER=replay and cold caches. Every
+response served from a cache instead of the provider would be missing from
+the recording, so replay must answer every call and return the same results
+as the recording run.
+
+The OpenAI chat and embedding clients are swapped for the fake providers
+(see llm_providers.py) under the real model names, so no network or API key
+is needed. Each phase runs in its own process, since the provider and cache
+settings are read at import time.
+
+Usage:
+    python recording_checks.py [--size 6] [--keep DIR]
+
+Exits with code 1 when replay fails or its results differ from the recording run.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Any, List
+
+PHASES = {
+    "warm": {"LLM_PROVIDER": "openai", "caches": True},
+    "record": {"LLM_PROVIDER": "record", "caches": True},
+    "replay": {"LLM_PROVIDER": "replay", "caches": False}
+}
+
+def phase_requests(size: int) -> List[Dict[str, Any]]:
+    """
+    The requests every phase runs: a whole event and one user's matches
+    """
+    from benchmark import make_roster
+
+    roster = make_roster(size)
+    return [
+        {"action": "process_event", "attendees": roster, "shortlist_size": 3},
+        {"action": "get_matches", "user": roster[0], "attendees": roster, "shortlist_size": 3}
+    ]
+
+def without_timestamps(value: Any) -> Any:
+    """
+    A response with its processing timestamps dropped, for comparing runs
+    """
+    if isinstance(value, dict):
+        return {key: without_timestamps(item) for key, item in value.items() if "timestamp" not in key}
+    if isinstance(value, list):
+        return [without_timestamps(item) for item in value]
+    return value
+
+def run_phase(size: int) -> List[Dict[str, Any]]:
+    """
+    Run the phase requests in this process, with offline stand-ins for the OpenAI clients
+    """
+    import llm_providers
+
+    class OfflineChatOpenAI(llm_providers.FakeChatModel):
+        def __init__(self, model: str, **kwargs):
+            super().__init__()
+            self.model_name = model
+
+    llm_providers.ChatOpenAI = OfflineChatOpenAI
+    llm_providers.OpenAIEmbeddings = llm_providers.FakeEmbeddings
+    from api_handler import NetworkingAPIHandler
+
+    handler = NetworkingAPIHandler()
+    try:
+        responses = []
+        for request in phase_requests(size):
+            response = handler.process_request(request)
+            if response["status"] != "success":
+                raise RuntimeError(f"{request['action']} failed: {response['message']}")
+            responses.append(without_timestamps(response["data"]))
+        return responses
+    finally:
+        handler.close()
+
+def spawn_phase(phase: str, directory: str, size: int) -> List[Dict[str, Any]]:
+    """
+    Run one phase in a child process sharing the recording and cache files in directory
+    """
+    settings = PHASES[phase]
+    env = dict(
+        os.environ,
+        LLM_PROVIDER=settings["LLM_PROVIDER"],
+        LLM_PROVIDER_RECORDING_PATH=os.path.join(directory, "recording.jsonl"),
+        LLM_RESPONSE_CACHE_PATH=os.path.join(directory, "llm_responses.sqlite3") if settings["caches"] else "",
+        EMBEDDING_CACHE_PATH=os.path.join(directory, "embeddings.sqlite3") if settings["caches"] else "",
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "offline"),
+        FAKE_LLM_LATENCY_SECONDS="0",
+        FAKE_EMBEDDING_LATENCY_SECONDS="0",
+        LINKEDIN_SCRAPE_DELAY_SECONDS="0",
+        LLM_REQUESTS_PER_MINUTE="1000000000",
+        LLM_TOKENS_PER_MINUTE="1000000000000"
+    )
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--phase", phase, "--size", str(size)],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}")
+    return json.loads(result.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that a recording made over warm caches replays completely")
+    parser.add_argument("--size", type=int, default=6, help="Attendees in the recorded event")
+    parser.add_argument("--keep", help="Directory to keep the recording and caches in (default: a temporary one)")
+    parser.add_argument("--phase", choices=sorted(PHASES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase:
+        # stdout carries the phase's results; the agents' progress output goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            responses = run_phase(args.size)
+        print(json.dumps(responses, default=str))
+        return
+
+    with contextlib.ExitStack() as stack:
+        directory = args.keep or stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(directory, exist_ok=True)
+        results = {}
+        for phase in PHASES:
+            try:
+                results[phase] = spawn_phase(phase, directory, args.size)
+            except Exception as e:
+                print(f"❌ {phase}: {e}")
+                sys.exit(1)
+            print(f"✅ {phase}: {len(results[phase])} requests")
+
+    if results["replay"] != results["record"]:
+        print("\n❌ Replayed results differ from the recording run")
+        sys.exit(1)
+    print("\n✅ Recording over warm caches replays completely")
+
+if __name__ == "__main__":
+    main()
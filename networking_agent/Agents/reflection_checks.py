@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Adaptive reflection checks for MatchmakingAgent.
+
+Runs MatchmakingAgent in adaptive reflection mode on the fake LLM and
+embedding providers (see llm_providers.py) for several roster sizes, with the
+score gap and similarity thresholds wide open, and checks when the reflection
+review is skipped:
+    - with TOP_MATCHES or fewer candidates there is no next-ranked candidate to
+      measure a margin against, so every user must be reviewed
+    - with more candidates every user clears the open thresholds, so every
+      user's review must be skipped, and only on the first attempt
+A skip decided by anything but the score and similarity margins fails here.
+
+Usage:
+    python reflection_checks.py [--sizes 2,3,4,5,12]
+
+Exits with code 1 when a user's review is skipped or run against these rules.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, Any, List
+
+DEFAULT_SIZES = [2, 3, 4, 5, 12]
+
+def check_roster(size: int) -> List[str]:
+    """
+    Match every attendee of a roster with adaptive reflection and return the rule violations
+    """
+    import matchmaking_agent
+    from benchmark import make_roster
+    from embedding_cache import EmbeddingCache
+
+    matchmaking_agent.embedding_cache = EmbeddingCache(path=None)
+    # A gap of 0 and a margin of -2 (below any cosine difference) accept every ranking with a next candidate
+    agent = matchmaking_agent.MatchmakingAgent(reflection_mode="adaptive", reflection_score_gap=0.0,
+                                               reflection_similarity_margin=-2.0)
+    try:
+        results = agent.find_matches_for_all_users(make_roster(size))
+    finally:
+        agent.close()
+
+    violations = []
+    for name, result in results.items():
+        candidates = len(result["candidates"])
+        expect_skip = candidates > matchmaking_agent.TOP_MATCHES
+        if result["reflection_skipped"] != expect_skip:
+            violations.append(
+                f"{name}: {candidates} candidate(s), reflection {'skipped' if result['reflection_skipped'] else 'run'}"
+            )
+        elif expect_skip and result["attempt"] != 0:
+            violations.append(f"{name}: reflection skipped after {result['attempt'] + 1} attempts")
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Check when adaptive reflection skips the match review")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated roster sizes")
+    args = parser.parse_args()
+
+    # Deterministic, free and instant providers; no disk caches or rate limits
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY_SECONDS": "0",
+        "FAKE_EMBEDDING_LATENCY_SECONDS": "0",
+        "LLM_RESPONSE_CACHE_PATH": "",
+        "EMBEDDING_CACHE_PATH": "",
+        "LLM_REQUESTS_PER_MINUTE": "1000000000",
+        "LLM_TOKENS_PER_MINUTE": "1000000000000"
+    })
+    from matchmaking_agent import TOP_MATCHES
+
+    failures = []
+    for size in (int(size) for size in args.sizes.split(",")):
+        expected = "skipped" if size - 1 > TOP_MATCHES else "run"
+        violations = check_roster(size)
+        print(f"{'✅' if not violations else '❌'} {size} attendees: reflection {expected} for every user")
+        for violation in violations:
+            print(f"    {violation}")
+        failures.extend(f"{size} attendees: {violation}" for violation in violations)
+
+    if failures:
+        print(f"\n❌ {len(failures)} reflection decision(s) broke the rules")
+        sys.exit(1)
+    print("\n✅ Adaptive reflection skips only on a measurable margin")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from typing import Dict, Any, List
+from pydantic import BaseModel, Field
+from dotenv import load_dotenv
+from llm_gateway import get_llm
+from perf_trace import traced
+
+# Load environment variables
+load_dotenv()
+llm = get_llm()
+
+class RegistrationAnalysis(BaseModel):
+    """Everything the registration agents produce, from a single structured-output call"""
+    input_quality_score: float = Field(description="Quality and completeness of the user's networking input (0-1)")
+    give_quality_score: float = Field(description="How valuable and specific is what the user can offer (0-1)")
+    take_quality_score: float = Field(description="How clear and actionable is what the user is seeking (0-1)")
+    overall_quality_score: float = Field(description="Overall networking potential of the give/take statements (0-1)")
+    evaluation_reasoning: str = Field(description="Detailed reasoning for the give/take scores")
+    match_potential: str = Field(description="Assessment of networking potential")
+    professional_summary: str = Field(description="2-3 sentence professional summary")
+    networking_summary: str = Field(description="1-2 sentence networking-focused summary")
+    skills_tags: List[str] = Field(description="5-8 skills and expertise tags")
+    industry_tags: List[str] = Field(description="3-5 industry and domain tags")
+    networking_tags: List[str] = Field(description="3-5 networking and collaboration tags")
+    career_stage: str = Field(description="Career stage assessment (e.g., 'Early Career', 'Mid-Career', 'Senior')")
+    networking_persona: str = Field(description="Networking persona type (e.g., 'Mentor', 'Collaborator', 'Connector')")
+    linkedin_summary: str = Field(description="A concise 2-3 sentence summary of the person's LinkedIn background, expertise, and what they can offer")
+    linkedin_tags: List[str] = Field(description="5-8 relevant tags from the LinkedIn profile that capture their skills, industry, and expertise")
+
+class RegistrationAnalysisAgent:
+    """
+    Agent that runs the whole registration analysis (input quality, give/take evaluation,
+    profile analysis, LinkedIn summary and tags) in one LLM call instead of four
+    """
+
+    def __init__(self):
+        self.llm = llm
+
+    @traced()
+    def analyze_registration(self, user_data: Dict[str, Any], linkedin_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Analyze a registration and split the result into the shapes the individual agents return
+        """
+        linkedin_data = linkedin_data or {}
+        prompt = f"""
+        Analyze this user's networking registration.
+
+        USER INPUT:
+        Name: {user_data.get('name', 'Unknown')}
+        About: {user_data.get('about', '')}
+        Give: {user_data.get('give', '')}
+        Take: {user_data.get('take', '')}
+
+        LINKEDIN DATA:
+        Title: {linkedin_data.get('title', 'N/A')}
+        Bio: {linkedin_data.get('bio', 'N/A')}
+        Experience: {'; '.join(linkedin_data.get('experience', []))}
+        Education: {'; '.join(linkedin_data.get('education', []))}
+
+        Provide:
+        1. Input Quality (0-1): completeness of the user input, specificity of the give/take statements,
+           professional tone and clarity, and potential for meaningful networking matches
+        2. Give Quality (0-1), Take Quality (0-1) and Overall Networking Potential (0-1) of the give/take statements,
+           with detailed reasoning and an assessment of their match potential
+        3. Professional Summary (2-3 sentences) and Networking Summary (1-2 sentences)
+        4. Skills Tags (5-8), Industry Tags (3-5) and Networking Tags (3-5)
+        5. Career Stage and primary Networking Persona
+        6. LinkedIn Summary: 2-3 sentences on their LinkedIn background, expertise, and what they can offer,
+           with 5-8 LinkedIn tags for their skills, industry, and expertise
+
+        Focus on what makes them valuable for networking and collaboration.
+        """
+
+        messages = [
+            {"role": "system", "content": "You are an expert networking coach and professional profile analyst."},
+            {"role": "user", "content": prompt}
+        ]
+
+        result = self.llm.with_structured_output(RegistrationAnalysis).invoke(messages)
+
+        return {
+            "input_quality_score": max(0.0, min(1.0, result.input_quality_score)),
+            "give_take_evaluation": {
+                "give_quality_score": result.give_quality_score,
+                "take_quality_score": result.take_quality_score,
+                "overall_quality_score": result.overall_quality_score,
+                "evaluation_reasoning": result.evaluation_reasoning,
+                "match_potential": result.match_potential
+            },
+            "profile_analysis": {
+                "professional_summary": result.professional_summary,
+                "networking_summary": result.networking_summary,
+                "skills_tags": result.skills_tags,
+                "industry_tags": result.industry_tags,
+                "networking_tags": result.networking_tags,
+                "career_stage": result.career_stage,
+                "networking_persona": result.networking_persona,
+                "all_tags": result.skills_tags + result.industry_tags + result.networking_tags
+            },
+            "linkedin_summary": {
+                "summary": result.linkedin_summary,
+                "tags": result.linkedin_tags
+            }
+        }
@@ -0,0 +1,91 @@
+"""
+Registration result cache.
+
+Completed registrations are keyed by a hash of the profile fields, the
+registration mode and the model versions that produced them, and expire
+after a TTL. The cache is
+size-bounded with least-recently-used eviction.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from embedding_cache import normalize_text
+
+DEFAULT_TTL_SECONDS = float(os.getenv("REGISTRATION_CACHE_TTL_SECONDS", "3600"))
+DEFAULT_MAX_ITEMS = int(os.getenv("REGISTRATION_CACHE_MAX_ITEMS", "1024"))
+
+PROFILE_FIELDS = ["name", "linkedin_url", "about", "give", "take"]
+
+class RegistrationCache:
+    """
+    In-memory TTL + LRU cache of processed user registrations
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_items: int = DEFAULT_MAX_ITEMS):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(user_data: Dict[str, Any], model_versions: Dict[str, str], registration_mode: str = "split") -> str:
+        """
+        Fingerprint a profile together with how and by which models it was processed
+        """
+        content = {field: normalize_text(str(user_data.get(field, ""))) for field in PROFILE_FIELDS}
+        content["model_versions"] = model_versions
+        content["registration_mode"] = registration_mode
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of a fresh cached registration, or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a copy of a registration, evicting the least recently used entries
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0,
+                "items": len(self._entries)
+            }
@@ -0,0 +1,83 @@
+"""
+Event-level give/ask similarity engine.
+
+All give and ask embeddings for an event are stacked into two normalized
+float32 matrices so the full ask->give similarity matrix is one matmul;
+give->ask is its transpose.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Callable
+import numpy as np
+from embedding_cache import normalize_text
+
+def profile_key(user: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Identify a profile by name and the give/ask text its embeddings came from
+    """
+    user_ask = user.get("ask", user.get("take", ""))
+    return (user.get("name", ""), normalize_text(user.get("give", "")), normalize_text(user_ask))
+
+def _exact_profile_key(user: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    """
+    Identify a profile by name and its give/ask text exactly as written; cheap enough to look up per match
+    """
+    return (user.get("name", ""), user.get("give", ""), user.get("ask", user.get("take", "")))
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row, leaving all-zero rows untouched
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+class SimilarityMatrix:
+    """
+    Precomputed give/ask cosine similarities for every pair of users in an event
+    """
+
+    def __init__(self, users: List[Dict[str, Any]], give_embeddings: np.ndarray, ask_embeddings: np.ndarray):
+        self.index = {profile_key(user): i for i, user in enumerate(users)}
+        # Rows resolved once per profile, so matching every user against the event normalizes no text
+        self._rows = {_exact_profile_key(user): i for i, user in enumerate(users)}
+        self.give_matrix = _normalize_rows(np.asarray(give_embeddings, dtype=np.float32))
+        self.ask_matrix = _normalize_rows(np.asarray(ask_embeddings, dtype=np.float32))
+
+        # ask_give[i, j] = sim(ask of i, give of j); give_ask[i, j] = sim(give of i, ask of j)
+        self.ask_give = self.ask_matrix @ self.give_matrix.T
+        self.give_ask = self.ask_give.T
+
+    @classmethod
+    def from_users(cls, users: List[Dict[str, Any]], embed_fn: Callable[[List[str]], np.ndarray]) -> "SimilarityMatrix":
+        """
+        Build the matrix by embedding every give and ask in one batched call
+        """
+        gives = [user.get("give", "") for user in users]
+        asks = [user.get("ask", user.get("take", "")) for user in users]
+        embeddings = embed_fn(gives + asks)
+        return cls(users, embeddings[:len(users)], embeddings[len(users):])
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def row(self, user: Dict[str, Any]) -> Optional[int]:
+        """
+        Get the user's row, or None if their current give/ask is not in the matrix. Profiles whose
+        text differs only in normalization fall back to the normalized index once, then are remembered.
+        """
+        key = _exact_profile_key(user)
+        row = self._rows.get(key)
+        if row is None:
+            row = self.index.get(profile_key(user))
+            if row is not None:
+                self._rows[key] = row
+        return row
+
+    def similarities(self, user: Dict[str, Any], candidates: List[Dict[str, Any]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get (user ask <-> candidate give, user give <-> candidate ask) similarity vectors,
+        or None if any profile is missing from the matrix
+        """
+        rows = [self.row(profile) for profile in [user] + candidates]
+        if None in rows:
+            return None
+        return self.ask_give[rows[0], rows[1:]], self.give_ask[rows[0], rows[1:]]
@@ -1,11 +1,12 @@
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field, validator
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from llm_gateway import get_llm
+from perf_trace import traced
 
 # Load environment variables
 load_dotenv()
-llm = ChatOpenAI(model="gpt-4o")
+llm = get_llm()
 
 class UserInput(BaseModel):
     """User input data structure"""
@@ -51,9 +52,10 @@ class UserInputAgent:
         except Exception as e:
             raise ValueError(f"Invalid user input: {str(e)}")
     
-    def enhance_user_input(self, user_input: UserInput) -> Dict[str, Any]:
+    def enhance_user_input(self, user_input: UserInput, input_quality_score: Optional[float] = None) -> Dict[str, Any]:
         """
-        Enhance user input with additional processing
+        Enhance user input with additional processing.
+        Pass input_quality_score when it was already assessed elsewhere to skip the LLM call.
         """
         # Clean and enhance the input
         enhanced_data = {
@@ -62,11 +64,14 @@ class UserInputAgent:
             "about": user_input.about,
             "give": user_input.give,
             "take": user_input.take,
-            "input_quality_score": self._assess_input_quality(user_input)
+            "input_quality_score": (
+                input_quality_score if input_quality_score is not None else self._assess_input_quality(user_input)
+            )
         }
         
         return enhanced_data
     
+    @traced()
     def _assess_input_quality(self, user_input: UserInput) -> float:
         """
         Assess the quality of user input (0-1 score)
@@ -95,6 +100,7 @@ class UserInputAgent:
         except:
             return 0.5  # Default score if parsing fails
     
+    @traced()
     def process_user_registration(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Complete user registration process